@@ -1,20 +1,28 @@
 from __future__ import annotations
 
 from datetime import datetime
+from itertools import groupby
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from pydantic import BaseModel
-
-from sqlalchemy.orm import Session
-
-from db import SessionLocal
-
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_
-
+from api.export import ExportFormat, export_response
+from api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    set_next_cursor,
+)
+from database import ReadSessionLocal, get_async_read_db, get_db
 from models.competitor import Competitor, CompetitorPost
+from models.post_metric import PostMetric
+from services.archive import read_archive
+from services.post_metrics import epoch, velocity_curve
 
 router = APIRouter(prefix="/api/competitors", tags=["competitors"])
 
@@ -49,6 +57,28 @@ class CompetitorPostResponse(BaseModel):
         from_attributes = True
 
 
+class MetricPointResponse(BaseModel):
+    sampled_at: datetime
+    resolution: int
+    likes: int | None
+    views: int | None
+    likes_per_hour: float | None
+    views_per_hour: float | None
+
+
+class PostMetricsResponse(BaseModel):
+    post_id: int
+    points: list[MetricPointResponse]
+
+
+def _metrics_range(stmt, since: datetime | None, until: datetime | None):
+    if since is not None:
+        stmt = stmt.where(PostMetric.sampled_at >= epoch(since))
+    if until is not None:
+        stmt = stmt.where(PostMetric.sampled_at < epoch(until))
+    return stmt
+
+
 @router.post("", response_model=CompetitorResponse, status_code=status.HTTP_201_CREATED)
 def create_competitor(payload: CompetitorCreate, db: Session = Depends(get_db)):
     handle = payload.instagram_handle.lstrip("@")
@@ -63,22 +93,153 @@ def create_competitor(payload: CompetitorCreate, db: Session = Depends(get_db)):
     return competitor
 
 
+def _posts_export(
+    competitor_id: int | None,
+    since: datetime | None,
+    until: datetime | None,
+    fmt: ExportFormat,
+    name: str,
+):
+    stmt = select(
+        CompetitorPost.id,
+        CompetitorPost.competitor_id,
+        Competitor.instagram_handle,
+        CompetitorPost.post_url,
+        CompetitorPost.post_type,
+        CompetitorPost.caption,
+        CompetitorPost.posted_at,
+        CompetitorPost.detected_at,
+    ).join(Competitor, Competitor.id == CompetitorPost.competitor_id)
+    if competitor_id is not None:
+        stmt = stmt.where(CompetitorPost.competitor_id == competitor_id)
+    if since is not None:
+        stmt = stmt.where(CompetitorPost.posted_at >= since)
+    if until is not None:
+        stmt = stmt.where(CompetitorPost.posted_at < until)
+    return export_response(ReadSessionLocal, stmt.order_by(CompetitorPost.id), fmt, name)
+
+
 @router.get("", response_model=list[CompetitorResponse])
-def list_competitors(db: Session = Depends(get_db)):
-    return db.scalars(select(Competitor).order_by(Competitor.added_at.desc())).all()
+async def list_competitors(db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.scalars(select(Competitor).order_by(Competitor.added_at.desc()))).all()
+
+
+@router.get("/posts/export")
+def export_all_competitor_posts(
+    format: ExportFormat = Query(default="ndjson"),
+    competitor_id: int | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+):
+    """Stream posts across all competitors as NDJSON or CSV, oldest first; ``since``/``until`` filter on ``posted_at``."""
+    return _posts_export(competitor_id, since, until, format, "competitor-posts")
+
+
+@router.get("/posts/{post_id}/metrics", response_model=PostMetricsResponse)
+async def get_post_metrics(
+    post_id: int,
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """A post's likes/views over time with the per-hour change between samples; ``since``/``until`` filter on ``sampled_at``."""
+    stmt = _metrics_range(select(PostMetric).where(PostMetric.post_id == post_id), since, until)
+    points = (await db.scalars(stmt.order_by(PostMetric.sampled_at))).all()
+    if not points and await db.get(CompetitorPost, post_id) is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return {"post_id": post_id, "points": velocity_curve(points)}
+
+
+@router.get("/{competitor_id}/metrics", response_model=list[PostMetricsResponse])
+async def get_competitor_metrics(
+    competitor_id: int,
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Velocity curves of every sampled post of a competitor, newest post first."""
+    if await db.get(Competitor, competitor_id) is None:
+        raise HTTPException(status_code=404, detail="Competitor not found")
+
+    stmt = _metrics_range(select(PostMetric).where(PostMetric.competitor_id == competitor_id), since, until)
+    points = (await db.scalars(stmt.order_by(PostMetric.post_id.desc(), PostMetric.sampled_at))).all()
+    curves = []
+    for post_id, group in groupby(points, key=lambda point: point.post_id):
+        curves.append({"post_id": post_id, "points": velocity_curve(group)})
+    return curves
 
 
 @router.get("/{competitor_id}/posts", response_model=list[CompetitorPostResponse])
-def list_competitor_posts(competitor_id: int, db: Session = Depends(get_db)):
-    competitor = db.get(Competitor, competitor_id)
+async def list_competitor_posts(
+    competitor_id: int,
+    response: Response,
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List a competitor's posts newest first, one page at a time.
+
+    ``since``/``until`` filter on ``posted_at``. When more rows are available, the
+    ``X-Next-Cursor`` response header holds the cursor for the next page.
+    """
+    competitor = await db.get(Competitor, competitor_id)
     if not competitor:
         raise HTTPException(status_code=404, detail="Competitor not found")
 
-    return db.scalars(
-        select(CompetitorPost)
-        .where(CompetitorPost.competitor_id == competitor_id)
-        .order_by(CompetitorPost.posted_at.desc().nullslast(), CompetitorPost.detected_at.desc())
-    ).all()
+    stmt = select(CompetitorPost).where(CompetitorPost.competitor_id == competitor_id)
+    if since is not None:
+        stmt = stmt.where(CompetitorPost.posted_at >= since)
+    if until is not None:
+        stmt = stmt.where(CompetitorPost.posted_at < until)
+    if cursor:
+        posted_at, detected_at, post_id = decode_cursor(cursor, datetime, datetime, int)
+        stmt = stmt.where(
+            keyset_after(
+                CompetitorPost.posted_at,
+                posted_at,
+                [CompetitorPost.detected_at, CompetitorPost.id],
+                [detected_at, post_id],
+            )
+        )
+    stmt = stmt.order_by(
+        CompetitorPost.posted_at.desc().nullslast(),
+        CompetitorPost.detected_at.desc(),
+        CompetitorPost.id.desc(),
+    ).limit(limit + 1)
+
+    posts = (await db.scalars(stmt)).all()
+    if len(posts) > limit:
+        posts = posts[:limit]
+        last = posts[-1]
+        set_next_cursor(response, encode_cursor(last.posted_at, last.detected_at, last.id))
+    return posts
+
+
+@router.get("/{competitor_id}/posts/export")
+async def export_competitor_posts(
+    competitor_id: int,
+    format: ExportFormat = Query(default="ndjson"),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Stream one competitor's posts as NDJSON or CSV, oldest first."""
+    if await db.get(Competitor, competitor_id) is None:
+        raise HTTPException(status_code=404, detail="Competitor not found")
+    return _posts_export(competitor_id, since, until, format, f"competitor-{competitor_id}-posts")
+
+
+@router.get("/{competitor_id}/posts/archive", response_model=list[CompetitorPostResponse])
+def list_archived_competitor_posts(
+    competitor_id: int,
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """List a competitor's posts moved to the Parquet archive, newest ``detected_at`` first."""
+    return read_archive(CompetitorPost.__table__, "detected_at", since, until, {"competitor_id": competitor_id}, limit)
 
 
 @router.delete("/{competitor_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.orm import sessionmaker
+
+EXPORT_CHUNK_ROWS = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(fmt: ExportFormat, columns: list[str], rows: list[Any], header: bool) -> str:
+    if fmt == "ndjson":
+        return "".join(json.dumps(dict(zip(columns, row)), default=_json_default) + "\n" for row in rows)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows(
+        [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row] for row in rows
+    )
+    return buffer.getvalue()
+
+
+def stream_rows(session_factory: sessionmaker, stmt: Select, fmt: ExportFormat) -> Iterator[str]:
+    """Yield ``stmt``'s rows encoded as ``fmt``, ``EXPORT_CHUNK_ROWS`` at a time.
+
+    The session lives inside the generator, so it stays open for exactly as long
+    as the response is being sent, and rows come off a server-side cursor
+    instead of being loaded up front.
+    """
+    columns = [column.name for column in stmt.selected_columns]
+    with session_factory() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_ROWS))
+        header = True
+        for rows in result.partitions():
+            yield _encode(fmt, columns, rows, header)
+            header = False
+        if header and fmt == "csv":
+            yield _encode(fmt, columns, [], header)
+
+
+def export_response(session_factory: sessionmaker, stmt: Select, fmt: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%dT%H%M%S}.{fmt}"
+    return StreamingResponse(
+        stream_rows(session_factory, stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
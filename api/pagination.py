@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *kinds: type) -> list[Any]:
+    """Decode a cursor produced by :func:`encode_cursor`, converting each value to ``kinds``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("unexpected cursor shape")
+        return [
+            None if value is None else datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for value, kind in zip(values, kinds)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def keyset_after(
+    first: ColumnElement[Any],
+    first_value: Any,
+    rest: list[ColumnElement[Any]],
+    rest_values: list[Any],
+) -> ColumnElement[bool]:
+    """Rows after the cursor for ``ORDER BY first DESC NULLS LAST, *rest DESC``.
+
+    ``first`` may be nullable; ``rest`` must not be and should end with the
+    primary key so the ordering is total.
+    """
+    after_rest = tuple_(*rest) < tuple_(*rest_values)
+    if first_value is None:
+        return and_(first.is_(None), after_rest)
+    return or_(first.is_(None), first < first_value, and_(first == first_value, after_rest))
+
+
+def set_next_cursor(response: Response, cursor: str | None) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.database import get_db
+from core.database import pool_stats
+from models.database import get_async_read_db
 from models.research import CompetitorPost, Trend
+from services.rate_limit import provider_states
 
 router = APIRouter()
 
@@ -12,10 +15,22 @@ def health_check() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@router.get("/health/db")
+def database_health() -> dict[str, object]:
+    return {"pools": pool_stats()}
+
+
+@router.get("/health/providers")
+def provider_health() -> dict[str, object]:
+    return {"providers": provider_states()}
+
+
 @router.get("/dashboard")
-def dashboard(db: Session = Depends(get_db)) -> dict[str, object]:
-    trends = db.query(Trend).order_by(Trend.captured_at.desc()).limit(50).all()
-    competitor_posts = db.query(CompetitorPost).order_by(CompetitorPost.posted_at.desc()).limit(50).all()
+async def dashboard(db: AsyncSession = Depends(get_async_read_db)) -> dict[str, object]:
+    trends = (await db.scalars(select(Trend).order_by(Trend.captured_at.desc()).limit(50))).all()
+    competitor_posts = (
+        await db.scalars(select(CompetitorPost).order_by(CompetitorPost.posted_at.desc()).limit(50))
+    ).all()
 
     return {
         "trends": [
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from core.database import get_read_db as get_trends_db
+from database import get_read_db as get_posts_db
+from services.search import search_posts, search_trends
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+class TrendHit(BaseModel):
+    id: int
+    source: str
+    topic: str
+    url: str | None
+    fetched_at: datetime | None
+    snippet: str
+    rank: float
+
+
+class PostHit(BaseModel):
+    id: int
+    competitor_id: int
+    post_url: str
+    post_type: str | None
+    posted_at: datetime | None
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    trends: list[TrendHit]
+    posts: list[PostHit]
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(min_length=1, max_length=200),
+    scope: Literal["all", "trends", "posts"] = Query(default="all"),
+    limit: int = Query(default=20, ge=1, le=100),
+    trends_db: Session = Depends(get_trends_db),
+    posts_db: Session = Depends(get_posts_db),
+):
+    """Full-text search over trend topics/descriptions and competitor captions, best matches first."""
+    return {
+        "trends": search_trends(trends_db, q, limit) if scope in ("all", "trends") else [],
+        "posts": search_posts(posts_db, q, limit) if scope in ("all", "posts") else [],
+    }
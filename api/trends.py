@@ -1,17 +1,32 @@
 from __future__ import annotations
 
 from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from api.export import ExportFormat, export_response
+from api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+)
+from core.database import ReadSessionLocal, get_async_read_db
 from models.trend import Trend
+from services.archive import read_archive
+from services.trend_cache import CachedResponse, trend_cache
 
 router = APIRouter(prefix="/api/trends", tags=["trends"])
 
+TrendSort = Literal["recent", "score"]
+
 
 class TrendResponse(BaseModel):
     id: int
@@ -22,15 +37,150 @@ class TrendResponse(BaseModel):
     relevance_score: float | None
     fetched_at: datetime
     niche_tags: str | None
+    cluster_id: int | None
 
     class Config:
         from_attributes = True
 
 
-@router.get("", response_model=list[TrendResponse])
-def get_trends(source: str | None = Query(default=None), db: Session = Depends(get_db)):
+_trend_list = TypeAdapter(list[TrendResponse])
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+async def _render_trends(
+    db: AsyncSession,
+    source: str | None,
+    cluster_id: int | None,
+    since: datetime | None,
+    until: datetime | None,
+    sort: TrendSort,
+    limit: int,
+    cursor: str | None,
+) -> CachedResponse:
     stmt = select(Trend)
     if source:
         stmt = stmt.where(Trend.source == source)
-    stmt = stmt.order_by(Trend.fetched_at.desc())
-    return db.execute(stmt).scalars().all()
+    if cluster_id is not None:
+        stmt = stmt.where(Trend.cluster_id == cluster_id)
+    if since is not None:
+        stmt = stmt.where(Trend.fetched_at >= since)
+    if until is not None:
+        stmt = stmt.where(Trend.fetched_at < until)
+    if sort == "score":
+        if cursor:
+            score, trend_id = decode_cursor(cursor, float, int)
+            stmt = stmt.where(keyset_after(Trend.relevance_score, score, [Trend.id], [trend_id]))
+        stmt = stmt.order_by(Trend.relevance_score.desc().nullslast(), Trend.id.desc())
+    else:
+        if cursor:
+            fetched_at, trend_id = decode_cursor(cursor, datetime, int)
+            stmt = stmt.where(tuple_(Trend.fetched_at, Trend.id) < (fetched_at, trend_id))
+        stmt = stmt.order_by(Trend.fetched_at.desc(), Trend.id.desc())
+
+    trends = (await db.scalars(stmt.limit(limit + 1))).all()
+    headers: dict[str, str] = {}
+    if len(trends) > limit:
+        trends = trends[:limit]
+        last = trends[-1]
+        sort_key = last.relevance_score if sort == "score" else last.fetched_at
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_key, last.id)
+
+    body = _trend_list.dump_json(_trend_list.validate_python(trends, from_attributes=True))
+    return CachedResponse(body=body, headers=headers)
+
+
+@router.get("", response_model=list[TrendResponse])
+async def get_trends(
+    request: Request,
+    source: str | None = Query(default=None),
+    cluster_id: int | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    sort: TrendSort = Query(default="recent"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """List trends newest first, or highest ``relevance_score`` first with ``sort=score``, one page at a time.
+
+    When more rows are available, the ``X-Next-Cursor`` response header holds the
+    cursor to pass back for the next page. Responses carry an ``ETag`` and
+    ``Last-Modified`` that only change after an aggregation run, so conditional
+    requests get a 304 and repeated polls are served from memory.
+    """
+    key = (source, cluster_id, since, until, sort, limit, cursor)
+    generation, last_modified = trend_cache.state()
+    etag = trend_cache.etag(key, generation)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = trend_cache.get(key, generation)
+    if cached is None:
+        cached = await _render_trends(db, source, cluster_id, since, until, sort, limit, cursor)
+        trend_cache.put(key, generation, cached)
+
+    return Response(content=cached.body, media_type="application/json", headers={**headers, **cached.headers})
+
+
+@router.get("/archive", response_model=list[TrendResponse])
+def get_archived_trends(
+    source: str | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """List trends moved to the Parquet archive by the retention job, newest ``last_seen_at`` first."""
+    equals = {"source": source} if source else None
+    return read_archive(Trend.__table__, "last_seen_at", since, until, equals, limit)
+
+
+@router.get("/export")
+def export_trends(
+    format: ExportFormat = Query(default="ndjson"),
+    source: str | None = Query(default=None),
+    since: datetime | None = Query(default=None),
+    until: datetime | None = Query(default=None),
+):
+    """Stream every matching trend as NDJSON or CSV, oldest first; ``since``/``until`` filter on ``fetched_at``."""
+    stmt = select(
+        Trend.id,
+        Trend.source,
+        Trend.topic,
+        Trend.description,
+        Trend.url,
+        Trend.relevance_score,
+        Trend.signal,
+        Trend.published_at,
+        Trend.niche_tags,
+        Trend.cluster_id,
+        Trend.seen_count,
+        Trend.fetched_at,
+        Trend.first_seen_at,
+        Trend.last_seen_at,
+    )
+    if source:
+        stmt = stmt.where(Trend.source == source)
+    if since is not None:
+        stmt = stmt.where(Trend.fetched_at >= since)
+    if until is not None:
+        stmt = stmt.where(Trend.fetched_at < until)
+    return export_response(ReadSessionLocal, stmt.order_by(Trend.id), format, "trends")
@@ -0,0 +1,172 @@
+"""Compare the async ``GET /api/trends`` route with an equivalent sync route under load.
+
+Both routes run the same query against the same seeded SQLite file behind a real
+uvicorn server in a child process. The sync route holds one of Starlette's threadpool workers for
+the whole request; the async route only awaits the database. Every request uses
+a distinct ``since`` value so the in-process trend cache never answers it.
+
+    python benchmarks/async_read_load.py --requests 2000 --concurrency 200
+
+Measured results show no speedup. With ``--requests 200 --concurrency 50`` runs
+ranged from async at 99 req/s vs sync at 112 (p50 323 vs 259 ms) to async at
+109 vs sync at 82. With 2000/200 both stayed between 65 and 83 req/s, with p50
+of 1.3-1.8 s either way. aiosqlite still runs each query on a worker thread, and
+both routes share one connection pool, so the differences are within run-to-run
+noise. What the async route saves is Starlette threadpool workers for other
+sync endpoints, not request latency.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Query  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from api.trends import TrendResponse, router as trends_router  # noqa: E402
+from core.database import Base, ReadSessionLocal, SessionLocal, engine  # noqa: E402
+from models.trend import Trend  # noqa: E402
+
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if db.scalar(select(Trend.id).limit(1)) is not None:
+            return
+        db.add_all(
+            Trend(
+                source=("google", "reddit", "news")[i % 3],
+                topic=f"topic {i}",
+                topic_key=f"topic {i}",
+                description="benchmark row",
+                fetched_at=BASE_TIME + timedelta(minutes=i),
+            )
+            for i in range(rows)
+        )
+        db.commit()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(trends_router)
+
+    @app.get("/sync/trends", response_model=list[TrendResponse])
+    def sync_trends(
+        since: datetime | None = Query(default=None),
+        limit: int = Query(default=50),
+    ):
+        # The session is opened inline rather than through a yield dependency so
+        # its teardown cannot queue behind requests waiting for a pooled connection.
+        stmt = select(Trend).order_by(Trend.fetched_at.desc(), Trend.id.desc()).limit(limit)
+        if since is not None:
+            stmt = stmt.where(Trend.fetched_at >= since)
+        with ReadSessionLocal() as db:
+            return db.scalars(stmt).all()
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, __file__, "--serve", str(port)], env=os.environ.copy())
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("benchmark server did not start")
+
+
+async def load(base_url: str, path: str, total: int, concurrency: int) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def one(i: int) -> None:
+            nonlocal errors
+            since = (BASE_TIME + timedelta(seconds=i)).isoformat()
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, params={"since": since})
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    return
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        raise RuntimeError(f"all {total} requests to {path} failed")
+    latencies.sort()
+    return {
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        uvicorn.run(build_app(), host="127.0.0.1", port=args.serve, log_level="warning")
+        return
+
+    seed(args.rows)
+    port = free_port()
+    server = start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for label, path in (("sync", "/sync/trends"), ("async", "/api/trends")):
+            asyncio.run(load(base_url, path, min(args.concurrency, args.requests), args.concurrency))
+            result = asyncio.run(load(base_url, path, args.requests, args.concurrency))
+            print(
+                f"{label:>5}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                f"p95 {result['p95_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}"
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,245 @@
+from __future__ import annotations
+
 import os
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Generator
+from typing import Any
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./trends.db")
 
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT_SECONDS = 30
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_SQLITE_BUSY_TIMEOUT_MS = 5000
+DEFAULT_SQLITE_CACHE_SIZE_KIB = 65536
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+_engines: dict[str, Engine] = {}
+_engine_cache: dict[tuple[str, bool], Engine | AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+
+class _PoolStatsMixin:
+    """Records pool checkouts and how long callers waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return connection
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_seconds / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _sqlite_pragmas(read_only: bool) -> Callable[[Any, Any], None]:
+    busy_timeout = _env_int("SQLITE_BUSY_TIMEOUT_MS", DEFAULT_SQLITE_BUSY_TIMEOUT_MS)
+    cache_size = _env_int("SQLITE_CACHE_SIZE_KIB", DEFAULT_SQLITE_CACHE_SIZE_KIB)
+
+    def apply(dbapi_connection: Any, _connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            # Switching to WAL is persistent and needs a write lock, so only the
+            # writer engine does it; readers pick it up from the database file.
+            if not read_only:
+                # auto_vacuum only takes effect on a new file; see db.maintenance for old ones.
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute(f"PRAGMA cache_size=-{cache_size}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+    return apply
+
+
+def _engine_options(url: str, poolclass: type) -> dict[str, Any]:
+    options: dict[str, Any] = {}
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+
+    if not _is_memory_sqlite(url):
+        options.update(
+            poolclass=poolclass,
+            pool_size=_env_int("DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT_SECONDS", DEFAULT_POOL_TIMEOUT_SECONDS),
+            pool_recycle=_env_int("DB_POOL_RECYCLE_SECONDS", DEFAULT_POOL_RECYCLE_SECONDS),
+            pool_pre_ping=not is_sqlite,
+        )
+    return options
+
+
+def _cached_engine(url: str, read_only: bool, build: Callable[[], Engine | AsyncEngine]) -> Engine | AsyncEngine:
+    """Return the engine already built for ``url``/``read_only`` in this process, or build and register it.
+
+    Several modules configure the same ``DATABASE_URL``; sharing engines keeps one
+    writer pool per database and one entry per pool in :func:`pool_stats`.
+    """
+    key = (make_url(url).render_as_string(hide_password=False), read_only)
+    with _engines_lock:
+        engine = _engine_cache.get(key)
+        if engine is None:
+            engine = _engine_cache[key] = build()
+            sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+            name = sync_engine.url.render_as_string(hide_password=True)
+            _engines[name + (" (read-only)" if read_only else "")] = sync_engine
+        return engine
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def create_db_engine(url: str, *, read_only: bool = False) -> Engine:
+    """Create an engine with the project's pool settings and, on SQLite, connection pragmas.
+
+    SQLite connections run in WAL mode with a busy timeout, ``synchronous=NORMAL``,
+    foreign keys and a larger page cache. ``read_only`` engines additionally set
+    ``query_only`` so API and dashboard readers never take the write lock.
+    Pool size, overflow, timeout and recycle come from the ``DB_*`` settings.
+    Engines are shared per URL and ``read_only`` within the process.
+    """
+
+    def build() -> Engine:
+        engine = create_engine(url, **_engine_options(url, InstrumentedQueuePool))
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _sqlite_pragmas(read_only))
+        return engine
+
+    return _cached_engine(url, read_only, build)
+
+
+def async_url(url: str) -> str:
+    """Swap the driver in ``url`` for its asyncio counterpart (aiosqlite or asyncpg)."""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()!r}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str, *, read_only: bool = False) -> AsyncEngine:
+    """Asyncio counterpart of :func:`create_db_engine` with the same pool settings and pragmas."""
+    url = async_url(url)
+
+    def build() -> AsyncEngine:
+        engine = create_async_engine(url, **_engine_options(url, InstrumentedAsyncQueuePool))
+        if engine.dialect.name == "sqlite":
+            event.listen(engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+        return engine
+
+    return _cached_engine(url, read_only, build)
+
+
+def session_factory(engine: Engine) -> sessionmaker[Session]:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def session_dependency(factory: sessionmaker[Session]) -> Callable[[], Generator[Session, None, None]]:
+    """Build a FastAPI dependency that yields a session from ``factory`` and closes it afterwards."""
+
+    def get_session() -> Generator[Session, None, None]:
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return get_session
+
+
+def async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def async_session_dependency(
+    factory: async_sessionmaker[AsyncSession],
+) -> Callable[[], AsyncGenerator[AsyncSession, None]]:
+    """Async counterpart of :func:`session_dependency` for ``async def`` routes."""
+
+    async def get_session() -> AsyncGenerator[AsyncSession, None]:
+        async with factory() as db:
+            yield db
+
+    return get_session
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    """Checkout and wait statistics for every engine created by :func:`create_db_engine`."""
+    with _engines_lock:
+        engines = dict(_engines)
+    stats = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        stats[name] = pool.stats() if isinstance(pool, _PoolStatsMixin) else {"status": pool.status()}
+    return stats
+
+
+engine = create_db_engine(DATABASE_URL)
+read_engine = create_db_engine(DATABASE_URL, read_only=True)
+async_read_engine = create_async_db_engine(DATABASE_URL, read_only=True)
+SessionLocal = session_factory(engine)
+ReadSessionLocal = session_factory(read_engine)
+AsyncReadSessionLocal = async_session_factory(async_read_engine)
+Base = declarative_base()
+
+get_db = session_dependency(SessionLocal)
+get_read_db = session_dependency(ReadSessionLocal)
+get_async_read_db = async_session_dependency(AsyncReadSessionLocal)
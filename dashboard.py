@@ -1,6 +1,9 @@
+import math
 import os
 import sqlite3
+from dataclasses import dataclass
 from datetime import datetime
+from html import escape
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +12,8 @@ import streamlit as st
 
 st.set_page_config(page_title="ScriptSpy 🔍", layout="wide")
 
+PAGE_SIZES = [10, 25, 50, 100]
+
 
 def apply_dark_theme() -> None:
     st.markdown(
@@ -75,6 +80,10 @@ def detect_db_path() -> str:
 def get_connection(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    # Match the app's engine settings so the dashboard waits on the scheduler's
+    # writes instead of failing with "database is locked".
+    conn.execute(f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))}")
+    conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
@@ -90,6 +99,62 @@ def get_columns(conn: sqlite3.Connection, table: str) -> list[str]:
     return [row[1] for row in rows]
 
 
+# Connections are cached per db_path and DbState carries db_path, so the
+# connection itself never needs to be part of a cache key.
+cache_query = st.cache_data(show_spinner=False, hash_funcs={sqlite3.Connection: lambda _: None})
+
+
+@dataclass(frozen=True)
+class Schema:
+    columns: dict[str, list[str]]
+
+    @property
+    def tables(self) -> list[str]:
+        return list(self.columns)
+
+
+@dataclass(frozen=True)
+class DbState:
+    """Cache key for everything read from the database.
+
+    ``data_version`` changes when another connection commits, and the file
+    mtimes catch commits made through this dashboard's own connection.
+    """
+
+    db_path: str
+    schema_version: int
+    data_version: int
+    mtime_ns: int
+
+
+def _mtime_ns(db_path: str) -> int:
+    mtimes = [0]
+    for path in (Path(db_path), Path(f"{db_path}-wal")):
+        try:
+            mtimes.append(path.stat().st_mtime_ns)
+        except OSError:
+            continue
+    return max(mtimes)
+
+
+def get_db_state(conn: sqlite3.Connection, db_path: str) -> DbState:
+    return DbState(
+        db_path=db_path,
+        schema_version=conn.execute("PRAGMA schema_version").fetchone()[0],
+        data_version=conn.execute("PRAGMA data_version").fetchone()[0],
+        mtime_ns=_mtime_ns(db_path),
+    )
+
+
+@cache_query
+def resolve_schema(conn: sqlite3.Connection, db_path: str, schema_version: int) -> Schema:
+    return Schema(columns={table: get_columns(conn, table) for table in list_tables(conn)})
+
+
+def schema_for(conn: sqlite3.Connection, state: DbState) -> Schema:
+    return resolve_schema(conn, state.db_path, state.schema_version)
+
+
 def pick_table(tables: list[str], candidates: list[str]) -> str | None:
     lowered = {name.lower(): name for name in tables}
     for candidate in candidates:
@@ -120,13 +185,12 @@ def first_present(columns: list[str], options: list[str], default: str | None =
     return default
 
 
-def fetch_trends(conn: sqlite3.Connection) -> pd.DataFrame:
-    tables = list_tables(conn)
-    trend_table = pick_table(tables, ["trends", "trend", "topic_trends"])
+def _trend_query_parts(schema: Schema) -> tuple[str, list[str], str | None, str | None] | None:
+    trend_table = pick_table(schema.tables, ["trends", "trend", "topic_trends"])
     if not trend_table:
-        return pd.DataFrame(columns=["topic", "source", "description", "url", "created_at"])
+        return None
 
-    cols = get_columns(conn, trend_table)
+    cols = schema.columns[trend_table]
     topic_col = first_present(cols, ["topic", "name", "title", "keyword"], "topic")
     source_col = first_present(cols, ["source", "platform", "origin"], "source")
     desc_col = first_present(cols, ["description", "summary", "details"], "description")
@@ -140,26 +204,82 @@ def fetch_trends(conn: sqlite3.Connection) -> pd.DataFrame:
         f"{url_col} AS url" if url_col in cols else "'' AS url",
         f"{created_col} AS created_at" if created_col else "NULL AS created_at",
     ]
-    order = f"ORDER BY {created_col} DESC" if created_col else ""
-    query = f"SELECT {', '.join(select_parts)} FROM {trend_table} {order}"
-    return pd.read_sql_query(query, conn)
+    return trend_table, select_parts, source_col if source_col in cols else None, created_col
+
+
+@cache_query
+def fetch_trends(
+    conn: sqlite3.Connection,
+    state: DbState,
+    source: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> pd.DataFrame:
+    parts = _trend_query_parts(schema_for(conn, state))
+    if parts is None:
+        return pd.DataFrame(columns=["topic", "source", "description", "url", "created_at"])
 
+    trend_table, select_parts, source_col, created_col = parts
+    where, params = "", []
+    if source and source_col:
+        where = f"WHERE {source_col} = ?"
+        params.append(source)
+    # rowid breaks ties between rows of the same fetch so pages never overlap.
+    order = f"ORDER BY {created_col} DESC, rowid DESC" if created_col else "ORDER BY rowid DESC"
+    page = ""
+    if limit is not None:
+        page = "LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    query = f"SELECT {', '.join(select_parts)} FROM {trend_table} {where} {order} {page}"
+    return pd.read_sql_query(query, conn, params=params)
+
+
+@cache_query
+def fetch_trend_sources(conn: sqlite3.Connection, state: DbState) -> list[str]:
+    parts = _trend_query_parts(schema_for(conn, state))
+    if parts is None or parts[2] is None:
+        return []
+
+    trend_table, _, source_col, _ = parts
+    rows = conn.execute(
+        f"SELECT DISTINCT {source_col} FROM {trend_table} WHERE TRIM(COALESCE({source_col}, '')) != '' ORDER BY 1"
+    ).fetchall()
+    return [str(row[0]) for row in rows]
 
-def fetch_competitors(conn: sqlite3.Connection) -> tuple[pd.DataFrame, str | None, str | None]:
-    tables = list_tables(conn)
-    comp_table = pick_table(tables, ["competitors", "competitor", "accounts"])
-    posts_table = pick_table(tables, ["posts", "post", "competitor_posts", "content"])
+
+@cache_query
+def count_trends(conn: sqlite3.Connection, state: DbState, source: str | None = None) -> int:
+    parts = _trend_query_parts(schema_for(conn, state))
+    if parts is None:
+        return 0
+
+    trend_table, _, source_col, _ = parts
+    if source and source_col:
+        return conn.execute(f"SELECT COUNT(*) FROM {trend_table} WHERE {source_col} = ?", [source]).fetchone()[0]
+    return conn.execute(f"SELECT COUNT(*) FROM {trend_table}").fetchone()[0]
+
+
+@cache_query
+def fetch_competitors(
+    conn: sqlite3.Connection,
+    state: DbState,
+    limit: int = -1,
+    offset: int = 0,
+) -> tuple[pd.DataFrame, str | None, str | None]:
+    schema = schema_for(conn, state)
+    comp_table = pick_table(schema.tables, ["competitors", "competitor", "accounts"])
+    posts_table = pick_table(schema.tables, ["posts", "post", "competitor_posts", "content"])
 
     if not comp_table:
         return pd.DataFrame(columns=["id", "name", "handle", "post_count", "last_posted"]), None, None
 
-    comp_cols = get_columns(conn, comp_table)
+    comp_cols = schema.columns[comp_table]
     comp_id = first_present(comp_cols, ["id", "competitor_id", "account_id"], "id")
     name_col = first_present(comp_cols, ["name", "competitor_name", "display_name"], "name")
-    handle_col = first_present(comp_cols, ["handle", "username", "account_handle"], "handle")
+    handle_col = first_present(comp_cols, ["handle", "instagram_handle", "username", "account_handle"], "handle")
 
     if posts_table:
-        post_cols = get_columns(conn, posts_table)
+        post_cols = schema.columns[posts_table]
         post_fk = first_present(post_cols, ["competitor_id", "account_id", "owner_id", "profile_id"])
         post_date = first_present(post_cols, ["posted_at", "created_at", "published_at", "date"])
 
@@ -175,21 +295,33 @@ def fetch_competitors(conn: sqlite3.Connection) -> tuple[pd.DataFrame, str | Non
                 LEFT JOIN {posts_table} p
                     ON p.{post_fk} = c.{comp_id}
                 GROUP BY c.{comp_id}, c.{name_col}, c.{handle_col}
-                ORDER BY last_posted DESC
+                ORDER BY last_posted DESC, c.{comp_id}
+                LIMIT ? OFFSET ?
             """
-            return pd.read_sql_query(query, conn), comp_table, posts_table
+            return pd.read_sql_query(query, conn, params=[limit, offset]), comp_table, posts_table
 
-    query = f"SELECT {comp_id} AS id, {name_col} AS name, {handle_col} AS handle FROM {comp_table}"
-    df = pd.read_sql_query(query, conn)
+    query = (
+        f"SELECT {comp_id} AS id, {name_col} AS name, {handle_col} AS handle "
+        f"FROM {comp_table} ORDER BY {comp_id} LIMIT ? OFFSET ?"
+    )
+    df = pd.read_sql_query(query, conn, params=[limit, offset])
     df["post_count"] = 0
     df["last_posted"] = None
     return df, comp_table, posts_table
 
 
-def add_competitor(conn: sqlite3.Connection, comp_table: str, name: str, handle: str) -> str:
-    cols = get_columns(conn, comp_table)
+@cache_query
+def count_competitors(conn: sqlite3.Connection, state: DbState) -> int:
+    comp_table = pick_table(schema_for(conn, state).tables, ["competitors", "competitor", "accounts"])
+    if not comp_table:
+        return 0
+    return conn.execute(f"SELECT COUNT(*) FROM {comp_table}").fetchone()[0]
+
+
+def add_competitor(conn: sqlite3.Connection, state: DbState, comp_table: str, name: str, handle: str) -> str:
+    cols = schema_for(conn, state).columns[comp_table]
     name_col = first_present(cols, ["name", "competitor_name", "display_name"])
-    handle_col = first_present(cols, ["handle", "username", "account_handle"])
+    handle_col = first_present(cols, ["handle", "instagram_handle", "username", "account_handle"])
     created_col = first_present(cols, ["created_at", "added_at", "timestamp"])
     if not (name_col and handle_col):
         return "Could not add competitor: required columns are missing."
@@ -208,8 +340,11 @@ def add_competitor(conn: sqlite3.Connection, comp_table: str, name: str, handle:
     return "Competitor added."
 
 
-def fetch_competitor_posts(conn: sqlite3.Connection, posts_table: str, competitor_id: Any) -> pd.DataFrame:
-    cols = get_columns(conn, posts_table)
+@cache_query
+def fetch_competitor_posts(
+    conn: sqlite3.Connection, state: DbState, posts_table: str, competitor_id: Any
+) -> pd.DataFrame:
+    cols = schema_for(conn, state).columns[posts_table]
     fk_col = first_present(cols, ["competitor_id", "account_id", "owner_id", "profile_id"])
     caption_col = first_present(cols, ["caption", "text", "content", "description"], "caption")
     type_col = first_present(cols, ["post_type", "type", "content_type"], "post_type")
@@ -233,93 +368,165 @@ def fetch_competitor_posts(conn: sqlite3.Connection, posts_table: str, competito
     return pd.read_sql_query(query, conn, params=[competitor_id])
 
 
-def fetch_activity_log(conn: sqlite3.Connection) -> pd.DataFrame:
-    tables = list_tables(conn)
+@cache_query
+def fetch_activity_log(conn: sqlite3.Connection, state: DbState) -> pd.DataFrame:
+    schema = schema_for(conn, state)
+    tables = schema.tables
     log_table = pick_table(tables, ["activity_log", "events", "event_log", "logs"])
     if log_table:
-        cols = get_columns(conn, log_table)
+        cols = schema.columns[log_table]
         ts_col = first_present(cols, ["timestamp", "created_at", "time", "event_time"])
         msg_col = first_present(cols, ["description", "message", "event", "details"])
         if ts_col and msg_col:
             q = f"SELECT {ts_col} AS timestamp, {msg_col} AS description FROM {log_table} ORDER BY {ts_col} DESC LIMIT 100"
             return pd.read_sql_query(q, conn)
 
-    entries: list[dict[str, str]] = []
+    # Each branch is ordered and limited on its own, then the union is merged
+    # and limited again, so the page never reads more than a handful of rows.
+    branches: list[str] = []
     posts_table = pick_table(tables, ["posts", "post", "competitor_posts", "content"])
     comp_table = pick_table(tables, ["competitors", "competitor", "accounts"])
 
     if posts_table and comp_table:
-        pcols = get_columns(conn, posts_table)
-        ccols = get_columns(conn, comp_table)
+        pcols = schema.columns[posts_table]
+        ccols = schema.columns[comp_table]
         fk_col = first_present(pcols, ["competitor_id", "account_id", "owner_id", "profile_id"])
         date_col = first_present(pcols, ["posted_at", "created_at", "published_at", "date"])
         cname_col = first_present(ccols, ["name", "competitor_name", "display_name"])
         cid_col = first_present(ccols, ["id", "competitor_id", "account_id"])
         if fk_col and date_col and cname_col and cid_col:
-            q = f"""
-                SELECT p.{date_col} AS timestamp, c.{cname_col} AS competitor
-                FROM {posts_table} p
-                JOIN {comp_table} c ON c.{cid_col} = p.{fk_col}
-                ORDER BY p.{date_col} DESC
-                LIMIT 40
-            """
-            for row in conn.execute(q).fetchall():
-                entries.append(
-                    {
-                        "timestamp": row["timestamp"],
-                        "description": f"New post detected for {row['competitor']}",
-                    }
+            branches.append(
+                f"""
+                SELECT * FROM (
+                    SELECT p.{date_col} AS timestamp, 'New post detected for ' || c.{cname_col} AS description
+                    FROM {posts_table} p
+                    JOIN {comp_table} c ON c.{cid_col} = p.{fk_col}
+                    WHERE p.{date_col} IS NOT NULL
+                    ORDER BY p.{date_col} DESC
+                    LIMIT 40
                 )
+                """
+            )
 
-    trends = fetch_trends(conn)
-    if not trends.empty and "created_at" in trends.columns:
-        grouped = trends.dropna(subset=["created_at"]).groupby("created_at").size().reset_index(name="count")
-        for _, row in grouped.head(20).iterrows():
-            entries.append(
-                {
-                    "timestamp": row["created_at"],
-                    "description": f"Fetched {int(row['count'])} new trends",
-                }
+    trend_parts = _trend_query_parts(schema)
+    if "trend_runs" in tables:
+        branches.append(
+            """
+            SELECT * FROM (
+                SELECT COALESCE(finished_at, started_at) AS timestamp,
+                    'Fetched ' || trend_count || ' trends' AS description
+                FROM trend_runs
+                ORDER BY started_at DESC
+                LIMIT 20
             )
+            """
+        )
+    elif trend_parts and trend_parts[3]:
+        trend_table, _, _, created_col = trend_parts
+        branches.append(
+            f"""
+            SELECT * FROM (
+                SELECT {created_col} AS timestamp, 'Fetched ' || COUNT(*) || ' trends' AS description
+                FROM {trend_table}
+                WHERE {created_col} IS NOT NULL
+                GROUP BY {created_col}
+                ORDER BY {created_col} DESC
+                LIMIT 20
+            )
+            """
+        )
 
-    if not entries:
+    if not branches:
         return pd.DataFrame(columns=["timestamp", "description"])
 
-    df = pd.DataFrame(entries)
-    return df.sort_values("timestamp", ascending=False)
+    query = " UNION ALL ".join(branches) + " ORDER BY timestamp DESC LIMIT 100"
+    return pd.read_sql_query(query, conn)
 
 
-def render_trending_now(conn: sqlite3.Connection) -> None:
-    st.subheader("Trending Now")
-    trends = fetch_trends(conn)
+def _text(value: Any, default: str = "") -> str:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return default
+    return str(value)
+
+
+def _link(url: Any, label: str) -> str:
+    href = _text(url).strip()
+    if not href:
+        return ""
+    return f"<a href='{escape(href, quote=True)}' target='_blank'>{label}</a>"
+
+
+def render_cards(cards: list[str]) -> None:
+    """Render a page of cards as a single HTML element instead of one element per field."""
+    st.markdown("".join(cards), unsafe_allow_html=True)
+
+
+def page_controls(total: int, key: str) -> tuple[int, int]:
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    pages = max(1, math.ceil(total / page_size))
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page_{pages}")
+    st.caption(f"{total} total · page {int(page)} of {pages}")
+    return page_size, (int(page) - 1) * page_size
+
 
-    if trends.empty:
+def trend_card(trend: dict[str, Any]) -> str:
+    source = _text(trend.get("source"), "Unknown")
+    return (
+        "<div class='card'>"
+        f"<h3>{escape(_text(trend.get('topic'), '(untitled)'))}</h3>"
+        f"<strong>{source_emoji(source)} {escape(source)}</strong>"
+        f"<div class='muted'>{escape(_text(trend.get('description'), 'No description available.'))}</div>"
+        f"{_link(trend.get('url'), 'Open source link')}"
+        "</div>"
+    )
+
+
+def competitor_card(comp: dict[str, Any]) -> str:
+    return (
+        "<div class='card'>"
+        f"<h3>{escape(_text(comp.get('name')))}</h3>"
+        f"<strong>@{escape(_text(comp.get('handle')).lstrip('@'))}</strong>"
+        f"<div>Posts tracked: <strong>{int(comp.get('post_count', 0) or 0)}</strong></div>"
+        f"<div>Last posted: <strong>{escape(_text(comp.get('last_posted'), 'N/A') or 'N/A')}</strong></div>"
+        "</div>"
+    )
+
+
+def post_card(post: dict[str, Any]) -> str:
+    preview = _text(post.get("caption")).strip()[:140] or "(No caption)"
+    return (
+        "<div class='card'>"
+        f"<strong>{escape(preview)}</strong>"
+        f"<div>Type: <code>{escape(_text(post.get('post_type'), 'unknown'))}</code></div>"
+        f"<div>Posted: <code>{escape(_text(post.get('posted_at'), 'N/A'))}</code></div>"
+        f"{_link(post.get('url'), 'Open original post')}"
+        "</div>"
+    )
+
+
+def render_trending_now(conn: sqlite3.Connection, state: DbState) -> None:
+    st.subheader("Trending Now")
+    sources = fetch_trend_sources(conn, state)
+    if not count_trends(conn, state):
         st.info("No trend data found in the database yet.")
         return
 
-    sources = sorted([s for s in trends["source"].dropna().unique() if str(s).strip()])
-    selected_source = st.selectbox("Filter by source", ["All"] + list(sources))
-    if selected_source != "All":
-        trends = trends[trends["source"] == selected_source]
-
-    for _, trend in trends.iterrows():
-        emoji = source_emoji(str(trend.get("source", "")))
-        topic = trend.get("topic", "(untitled)")
-        source = trend.get("source", "Unknown")
-        desc = trend.get("description", "No description available.")
-        url = trend.get("url", "")
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown(f"### {topic}")
-        st.markdown(f"**{emoji} {source}**")
-        st.markdown(f"<div class='muted'>{desc}</div>", unsafe_allow_html=True)
-        if pd.notna(url) and str(url).strip():
-            st.markdown(f"[Open source link]({url})")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-
-def render_competitors(conn: sqlite3.Connection) -> None:
+    selected_source = st.selectbox("Filter by source", ["All"] + sources)
+    source = None if selected_source == "All" else selected_source
+    page_size, offset = page_controls(count_trends(conn, state, source), key=f"trends_{selected_source}")
+
+    trends = fetch_trends(conn, state, source, page_size, offset)
+    render_cards([trend_card(trend) for trend in trends.to_dict("records")])
+
+
+def render_competitors(conn: sqlite3.Connection, state: DbState) -> None:
     st.subheader("Competitors")
-    competitors, comp_table, posts_table = fetch_competitors(conn)
+    total = count_competitors(conn, state)
+    page_size, offset = page_controls(total, key="competitors") if total else (PAGE_SIZES[1], 0)
+    competitors, comp_table, posts_table = fetch_competitors(conn, state, page_size, offset)
 
     with st.expander("Add new competitor", expanded=False):
         col1, col2, col3 = st.columns([2, 2, 1])
@@ -334,60 +541,45 @@ def render_competitors(conn: sqlite3.Connection) -> None:
                 elif not name.strip() or not handle.strip():
                     st.warning("Enter both a name and handle.")
                 else:
-                    st.success(add_competitor(conn, comp_table, name, handle))
+                    st.success(add_competitor(conn, state, comp_table, name, handle))
                     st.rerun()
 
     if competitors.empty:
         st.info("No competitors tracked yet.")
         return
 
-    for _, comp in competitors.iterrows():
-        st.markdown("<div class='card'>", unsafe_allow_html=True)
-        st.markdown(f"### {comp['name']}")
-        st.markdown(f"**@{str(comp['handle']).lstrip('@')}**")
-        st.markdown(f"Posts tracked: **{int(comp.get('post_count', 0) or 0)}**")
-        st.markdown(f"Last posted: **{comp.get('last_posted') or 'N/A'}**")
-        st.markdown("</div>", unsafe_allow_html=True)
+    records = competitors.to_dict("records")
+    render_cards([competitor_card(comp) for comp in records])
 
     if posts_table:
-        options = {
-            f"{row['name']} (@{str(row['handle']).lstrip('@')})": row["id"]
-            for _, row in competitors.iterrows()
-        }
+        options = {f"{row['name']} (@{str(row['handle']).lstrip('@')})": row["id"] for row in records}
         selected = st.selectbox("View recent posts for", list(options.keys()))
-        posts = fetch_competitor_posts(conn, posts_table, options[selected])
+        posts = fetch_competitor_posts(conn, state, posts_table, options[selected])
 
         st.markdown("#### Recent posts")
         if posts.empty:
             st.write("No posts found for this competitor.")
         else:
-            for _, post in posts.iterrows():
-                preview = str(post.get("caption", "")).strip()[:140] or "(No caption)"
-                st.markdown("<div class='card'>", unsafe_allow_html=True)
-                st.markdown(f"**{preview}**")
-                st.markdown(f"Type: `{post.get('post_type', 'unknown')}`")
-                st.markdown(f"Posted: `{post.get('posted_at', 'N/A')}`")
-                url = post.get("url", "")
-                if pd.notna(url) and str(url).strip():
-                    st.markdown(f"[Open original post]({url})")
-                st.markdown("</div>", unsafe_allow_html=True)
-
-
-def render_activity_log(conn: sqlite3.Connection) -> None:
+            render_cards([post_card(post) for post in posts.to_dict("records")])
+
+
+def render_activity_log(conn: sqlite3.Connection, state: DbState) -> None:
     st.subheader("Activity Log")
-    activity = fetch_activity_log(conn)
+    activity = fetch_activity_log(conn, state)
 
     if activity.empty:
         st.info("No recent activity found.")
         return
 
-    for _, event in activity.head(100).iterrows():
-        ts = event.get("timestamp", "Unknown time")
-        desc = event.get("description", "")
-        st.markdown(
-            f"<div class='timeline-item'><div><strong>{ts}</strong></div><div>{desc}</div></div>",
-            unsafe_allow_html=True,
-        )
+    render_cards(
+        [
+            "<div class='timeline-item'>"
+            f"<div><strong>{escape(_text(event.get('timestamp'), 'Unknown time'))}</strong></div>"
+            f"<div>{escape(_text(event.get('description')))}</div>"
+            "</div>"
+            for event in activity.to_dict("records")
+        ]
+    )
 
 
 def main() -> None:
@@ -403,14 +595,15 @@ def main() -> None:
         st.error(f"Could not connect to database: {err}")
         return
 
+    state = get_db_state(conn, db_path)
     page = st.sidebar.radio("Navigate", ["Trending Now", "Competitors", "Activity Log"])
 
     if page == "Trending Now":
-        render_trending_now(conn)
+        render_trending_now(conn, state)
     elif page == "Competitors":
-        render_competitors(conn)
+        render_competitors(conn, state)
     else:
-        render_activity_log(conn)
+        render_activity_log(conn, state)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,23 @@
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from core.database import (
+    async_session_dependency,
+    async_session_factory,
+    create_async_db_engine,
+    create_db_engine,
+    session_dependency,
+    session_factory,
+)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
+engine = create_db_engine(DATABASE_URL)
+read_engine = create_db_engine(DATABASE_URL, read_only=True)
+async_read_engine = create_async_db_engine(DATABASE_URL, read_only=True)
+SessionLocal = session_factory(engine)
+ReadSessionLocal = session_factory(read_engine)
+AsyncReadSessionLocal = async_session_factory(async_read_engine)
 
-def get_db():
-    db: Session = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+get_db = session_dependency(SessionLocal)
+get_read_db = session_dependency(ReadSessionLocal)
+get_async_read_db = async_session_dependency(AsyncReadSessionLocal)
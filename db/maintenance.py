@@ -0,0 +1,56 @@
+"""One-off database maintenance, run while the API and schedulers are stopped.
+
+    python -m db.maintenance enable-incremental-vacuum [--database-url URL]
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+
+from sqlalchemy.engine import Engine
+
+from core.database import DATABASE_URL, create_db_engine
+
+logger = logging.getLogger(__name__)
+
+# Value of ``PRAGMA auto_vacuum`` for INCREMENTAL.
+INCREMENTAL = 2
+
+
+def enable_incremental_vacuum(engine: Engine) -> bool:
+    """Switch an existing SQLite file to incremental auto-vacuum; returns whether it was converted.
+
+    The mode of an existing file only changes on a full ``VACUUM``, which rewrites
+    the file under an exclusive lock, so this is not done by the retention jobs.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == INCREMENTAL:
+            return False
+        logger.info("Rebuilding %s with incremental auto-vacuum", engine.url.database)
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=DATABASE_URL)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "enable-incremental-vacuum",
+        help="rebuild the file so retention can return freed pages to the filesystem",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    engine = create_db_engine(args.database_url)
+    if args.command == "enable-incremental-vacuum":
+        converted = enable_incremental_vacuum(engine)
+        print("converted" if converted else "already incremental (or not SQLite); nothing to do")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Bring tables created by older versions up to the current models.
+
+``create_all`` only creates missing tables, so these run after it at startup.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import Connection, Table, bindparam, delete, func, inspect, select, update
+from sqlalchemy.engine import Engine
+
+from models.trend import Trend, normalize_topic
+
+logger = logging.getLogger(__name__)
+
+TREND_KEY_INDEX = "uq_trends_source_topic_key"
+
+
+def _add_missing_columns(conn: Connection, table: Table) -> list[str]:
+    """Add the columns of ``table`` that the database lacks and return their names.
+
+    They are added as nullable, since existing rows have no value yet; the
+    models always fill them in for new rows.
+    """
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    preparer = conn.dialect.identifier_preparer
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        conn.exec_driver_sql(
+            f"ALTER TABLE {preparer.format_table(table)} "
+            f"ADD COLUMN {preparer.format_column(column)} {column.type.compile(conn.dialect)}"
+        )
+        added.append(column.name)
+    return added
+
+
+def _has_trend_key(conn: Connection) -> bool:
+    inspector = inspect(conn)
+    keys = [constraint["column_names"] for constraint in inspector.get_unique_constraints("trends")]
+    keys += [index["column_names"] for index in inspector.get_indexes("trends") if index["unique"]]
+    return ["source", "topic_key"] in keys
+
+
+def _backfill_trends(conn: Connection, table: Table) -> None:
+    rows = conn.execute(select(table.c.id, table.c.topic).where(table.c.topic_key.is_(None))).all()
+    if rows:
+        conn.execute(
+            update(table).where(table.c.id == bindparam("trend_id")).values(topic_key=bindparam("key")),
+            [{"trend_id": trend_id, "key": normalize_topic(topic or "")} for trend_id, topic in rows],
+        )
+
+    seen_at = func.coalesce(table.c.fetched_at, datetime.utcnow())
+    conn.execute(update(table).where(table.c.first_seen_at.is_(None)).values(first_seen_at=seen_at))
+    conn.execute(update(table).where(table.c.last_seen_at.is_(None)).values(last_seen_at=seen_at))
+    conn.execute(update(table).where(table.c.seen_count.is_(None)).values(seen_count=1))
+
+
+def _collapse_duplicate_trends(conn: Connection, table: Table) -> int:
+    """Merge rows sharing a source and topic key into the newest one; returns how many were removed."""
+    key = (table.c.source, table.c.topic_key)
+    groups = conn.execute(
+        select(
+            func.max(table.c.id),
+            func.sum(table.c.seen_count),
+            func.min(table.c.first_seen_at),
+            func.max(table.c.last_seen_at),
+        )
+        .group_by(*key)
+        .having(func.count() > 1)
+    ).all()
+    if not groups:
+        return 0
+
+    conn.execute(
+        update(table)
+        .where(table.c.id == bindparam("trend_id"))
+        .values(seen_count=bindparam("count"), first_seen_at=bindparam("first"), last_seen_at=bindparam("last")),
+        [{"trend_id": trend_id, "count": count, "first": first, "last": last} for trend_id, count, first, last in groups],
+    )
+    newest = select(func.max(table.c.id)).group_by(*key).scalar_subquery()
+    return conn.execute(delete(table).where(table.c.id.not_in(newest))).rowcount
+
+
+def upgrade_trends(engine: Engine) -> None:
+    """Upgrade a ``trends`` table from before trends were upserted by source and topic.
+
+    Adds the missing columns, backfills them, merges the duplicate rows earlier
+    versions inserted on every run into ``seen_count``/``first_seen_at``, and then
+    creates the unique key and any missing indexes.
+    """
+    table = Trend.__table__
+    with engine.begin() as conn:
+        if not inspect(conn).has_table(table.name):
+            return
+
+        added = _add_missing_columns(conn, table)
+        if added:
+            logger.info("Added %s to %s", ", ".join(added), table.name)
+        _backfill_trends(conn, table)
+
+        if not _has_trend_key(conn):
+            removed = _collapse_duplicate_trends(conn, table)
+            logger.info("Merged %s duplicate %s rows", removed, table.name)
+            conn.exec_driver_sql(f"CREATE UNIQUE INDEX {TREND_KEY_INDEX} ON {table.name} (source, topic_key)")
+
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
@@ -1,20 +1,3 @@
-import os
-from typing import Generator
+from core.database import DATABASE_URL, Base, SessionLocal, engine, get_db
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
-
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./trends.db")
-
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
-
-
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+__all__ = ["DATABASE_URL", "Base", "SessionLocal", "engine", "get_db"]
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def insert_for(db: Session, entity: Any) -> sqlite.Insert | postgresql.Insert:
+    """Return an INSERT for ``entity`` that supports ``ON CONFLICT`` on the session's dialect.
+
+    Both SQLite (3.35+) and PostgreSQL also support ``RETURNING`` on the result,
+    so callers can get back exactly the rows that were inserted.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(entity)
+    if dialect == "postgresql":
+        return postgresql.insert(entity)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported on {dialect}")
@@ -1,74 +1,351 @@
 from __future__ import annotations
 
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session, sessionmaker
 
+from db.upsert import insert_for
+from jobs.retention import archive_and_prune
 from models.competitor import Competitor, CompetitorPost
-from services.instagram_monitor import fetch_recent_posts
-from services.notification import send_new_post_alert
+from services.instagram_monitor import close_http_client, fetch_new_posts_batch, fetch_recent_posts_batch
+from services.notification import (
+    enqueue_new_post_alert,
+    start_notification_dispatcher,
+    stop_notification_dispatcher,
+    wake_notification_dispatcher,
+)
+from services.job_runs import JOB_DEFAULTS, record_skipped_runs, track_job_run
+from services.poll_schedule import PollQueue
+from services.post_metrics import (
+    downsample,
+    refresh_interval_minutes,
+    sample_rows,
+    save_samples,
+    track_window,
+    tracked_posts,
+)
+from services.seen_posts import SeenPostFilter
 
+logger = logging.getLogger(__name__)
 
-scheduler = BackgroundScheduler(timezone="UTC")
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_CHECKS_PER_MINUTE = 10
+PINNED_POSTS = 3
+
+scheduler = BackgroundScheduler(timezone="UTC", job_defaults=JOB_DEFAULTS)
+seen_posts = SeenPostFilter.from_env()
+poll_queue = PollQueue()
+_session_factory: sessionmaker | None = None
+
+
+def _max_workers() -> int:
+    return max(1, int(os.getenv("COMPETITOR_CHECK_MAX_WORKERS", DEFAULT_MAX_WORKERS)))
+
+
+def _batch_size() -> int:
+    return max(1, int(os.getenv("COMPETITOR_CHECK_BATCH_SIZE", DEFAULT_BATCH_SIZE)))
+
+
+def _checks_per_minute() -> int:
+    return max(1, int(os.getenv("COMPETITOR_CHECKS_PER_MINUTE", DEFAULT_CHECKS_PER_MINUTE)))
+
+
+def _chunked(competitors: list[Competitor], size: int) -> list[list[Competitor]]:
+    return [competitors[i : i + size] for i in range(0, len(competitors), size)]
 
 
 def _save_new_posts(db: Session, competitor: Competitor, posts: list[dict]) -> list[CompetitorPost]:
-    existing_urls = {
-        row[0]
-        for row in db.execute(
-            select(CompetitorPost.post_url).where(CompetitorPost.competitor_id == competitor.id)
-        )
-    }
+    """Insert the posts that are not stored yet and queue an alert for each.
 
-    new_posts: list[CompetitorPost] = []
+    URLs already in ``seen_posts`` are dropped without touching the database. The
+    rest are inserted with ``ON CONFLICT DO NOTHING`` and only the rows actually
+    inserted come back, so the cost of a check does not grow with the
+    competitor's history.
+    """
+    now = datetime.utcnow()
+    rows: dict[str, dict] = {}
     for payload in posts:
-        if payload["post_url"] in existing_urls:
+        if payload["post_url"] in seen_posts:
             continue
-
-        post = CompetitorPost(
-            competitor_id=competitor.id,
-            post_url=payload["post_url"],
-            caption=payload.get("caption"),
-            post_type=payload.get("post_type"),
-            posted_at=payload.get("timestamp"),
-            is_new=True,
+        rows.setdefault(
+            payload["post_url"],
+            {
+                "competitor_id": competitor.id,
+                "post_url": payload["post_url"],
+                "caption": payload.get("caption"),
+                "post_type": payload.get("post_type"),
+                "posted_at": payload.get("timestamp"),
+                "detected_at": now,
+                "is_new": True,
+            },
         )
-        db.add(post)
-        new_posts.append(post)
 
-    competitor.last_checked_at = datetime.utcnow()
-    db.commit()
+    new_posts: list[CompetitorPost] = []
+    if rows:
+        stmt = insert_for(db, CompetitorPost).values(list(rows.values())).on_conflict_do_nothing()
+        new_posts = list(db.scalars(stmt.returning(CompetitorPost)))
 
     for post in new_posts:
-        db.refresh(post)
+        post.competitor = competitor
+        enqueue_new_post_alert(db, post)
+
+    inserted_ids = {post.post_url: post.id for post in new_posts}
+    competitor.last_checked_at = now
+    db.commit()
+
+    seen_posts.update(rows.keys())
+    seen_posts.update(inserted_ids)
+    return new_posts
+
+
+def _process_competitor(db: Session, competitor: Competitor, posts: list[dict]) -> int:
+    try:
+        new_posts = _save_new_posts(db, competitor, posts)
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to save posts for @%s", competitor.instagram_handle)
+        return 0
+
+    if new_posts:
+        wake_notification_dispatcher(_session_factory)
+    return len(new_posts)
+
+
+def run_competitor_check(
+    session_factory: sessionmaker,
+    max_workers: int | None = None,
+    batch_size: int | None = None,
+    competitor_ids: list[int] | None = None,
+) -> int:
+    """Check every competitor, or only ``competitor_ids``, for new posts; returns how many were stored."""
+    workers = max_workers or _max_workers()
+    size = batch_size or _batch_size()
+    new_posts = 0
+    samples: list[dict] = []
+
+    with session_factory() as db:
+        stmt = select(Competitor)
+        if competitor_ids is not None:
+            stmt = stmt.where(Competitor.id.in_(competitor_ids))
+        competitors = db.scalars(stmt).all()
+        if not competitors:
+            return 0
+
+        newest_posted_at = dict(
+            db.execute(
+                select(CompetitorPost.competitor_id, func.max(CompetitorPost.posted_at))
+                .where(CompetitorPost.competitor_id.in_([competitor.id for competitor in competitors]))
+                .group_by(CompetitorPost.competitor_id)
+            ).all()
+        )
+        chunks = _chunked(list(competitors), size)
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            thread_name_prefix="competitor-fetch",
+        ) as executor:
+            futures = {
+                executor.submit(
+                    fetch_new_posts_batch,
+                    [competitor.instagram_handle for competitor in chunk],
+                    seen_posts.__contains__,
+                    {competitor.instagram_handle: newest_posted_at.get(competitor.id) for competitor in chunk},
+                ): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    posts_by_handle = future.result()
+                except Exception:
+                    logger.exception(
+                        "Failed to fetch posts for %s",
+                        ", ".join(f"@{competitor.instagram_handle}" for competitor in chunk),
+                    )
+                    continue
+
+                sampled_at = datetime.utcnow()
+                for competitor in chunk:
+                    posts = posts_by_handle.get(competitor.instagram_handle, [])
+                    new_posts += _process_competitor(db, competitor, posts)
+                    samples += sample_rows(competitor.id, posts, seen_posts.get, sampled_at)
+
+        _save_metrics(db, samples)
 
     return new_posts
 
 
-def run_competitor_check(session_factory: sessionmaker) -> None:
+def _save_metrics(db: Session, samples: list[dict]) -> None:
+    try:
+        save_samples(db, samples)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to save %d engagement samples", len(samples))
+
+
+def refresh_post_metrics(session_factory: sessionmaker, batch_size: int | None = None) -> int:
+    """Re-sample likes/views of stored posts published within ``POST_METRICS_TRACK_HOURS``; returns samples saved."""
+    size = batch_size or _batch_size()
+    since = datetime.utcnow() - track_window()
+    samples: list[dict] = []
+
     with session_factory() as db:
-        competitors = db.scalars(select(Competitor)).all()
+        tracked = tracked_posts(db, since)
+        if not tracked:
+            return 0
+        competitors = db.scalars(select(Competitor).where(Competitor.id.in_(list(tracked)))).all()
+
+        for chunk in _chunked(list(competitors), size):
+            # Enough to reach the oldest tracked post, plus room for pinned posts.
+            limit = max(len(tracked[competitor.id]) for competitor in chunk) + PINNED_POSTS
+            try:
+                posts_by_handle = fetch_recent_posts_batch(
+                    [competitor.instagram_handle for competitor in chunk], limit=limit, newer_than=since
+                )
+            except Exception:
+                logger.exception(
+                    "Failed to refresh engagement for %s",
+                    ", ".join(f"@{competitor.instagram_handle}" for competitor in chunk),
+                )
+                continue
+
+            sampled_at = datetime.utcnow()
+            for competitor in chunk:
+                posts = posts_by_handle.get(competitor.instagram_handle, [])
+                samples += sample_rows(competitor.id, posts, tracked[competitor.id].get, sampled_at)
 
-        for competitor in competitors:
-            posts = fetch_recent_posts(competitor.instagram_handle)
-            new_posts = _save_new_posts(db, competitor, posts)
-            for post in new_posts:
-                post.competitor = competitor
-                send_new_post_alert(post)
+        _save_metrics(db, samples)
+    return len(samples)
+
+
+def run_due_competitor_checks(session_factory: sessionmaker) -> int:
+    """Check the competitors whose next poll is due, at most ``COMPETITOR_CHECKS_PER_MINUTE``; returns new posts."""
+    now = datetime.utcnow()
+    with session_factory() as db:
+        poll_queue.sync(db, now)
+    # The cap spreads a backlog of due accounts over the following ticks.
+    due = poll_queue.pop_due(now, _checks_per_minute())
+    if not due:
+        return 0
+
+    try:
+        with track_job_run(session_factory, "competitor-checker") as run:
+            run.item_count = run_competitor_check(session_factory, competitor_ids=due)
+    finally:
+        with session_factory() as db:
+            poll_queue.schedule(db, due, datetime.utcnow(), checked=True)
+    return run.item_count
+
+
+def _warm_seen_posts(session_factory: sessionmaker) -> None:
+    with session_factory() as db:
+        rows = db.execute(
+            select(CompetitorPost.post_url, CompetitorPost.id)
+            .order_by(CompetitorPost.id.desc())
+            .limit(seen_posts.max_size)
+        ).all()
+    seen_posts.update({post_url: post_id for post_url, post_id in reversed(rows)})
+
+
+def archive_old_posts(session_factory: sessionmaker) -> int:
+    """Archive expired competitor posts, keeping each competitor's newest one.
+
+    The newest post is what later checks count from; without it an account that
+    stopped posting would be fetched as new and its archived posts alerted again.
+    """
+    ranked = select(
+        CompetitorPost.id,
+        func.row_number()
+        .over(
+            partition_by=CompetitorPost.competitor_id,
+            order_by=(CompetitorPost.posted_at.desc().nulls_last(), CompetitorPost.id.desc()),
+        )
+        .label("rank"),
+    ).subquery()
+    newest = select(ranked.c.id).where(ranked.c.rank == 1)
+    return archive_and_prune(
+        session_factory, CompetitorPost.__table__, "detected_at", keep=CompetitorPost.id.in_(newest)
+    )
+
+
+def _run_post_retention(session_factory: sessionmaker) -> None:
+    try:
+        with track_job_run(session_factory, "competitor-post-retention") as run:
+            run.item_count = archive_old_posts(session_factory)
+    except Exception as exc:
+        logger.exception("Competitor post retention failed: %s", exc)
+
+
+def _run_metrics_refresh(session_factory: sessionmaker) -> None:
+    try:
+        with track_job_run(session_factory, "post-metrics-refresh") as run:
+            run.item_count = refresh_post_metrics(session_factory)
+    except Exception as exc:
+        logger.exception("Post metrics refresh failed: %s", exc)
+
+
+def _run_metrics_downsample(session_factory: sessionmaker) -> None:
+    try:
+        with track_job_run(session_factory, "post-metrics-downsample") as run, session_factory() as db:
+            run.item_count = downsample(db)
+    except Exception as exc:
+        logger.exception("Post metrics downsampling failed: %s", exc)
 
 
 def start_competitor_checker(session_factory: sessionmaker) -> None:
+    global _session_factory
     if scheduler.get_job("competitor-checker"):
         return
 
+    _session_factory = session_factory
+    _warm_seen_posts(session_factory)
+    start_notification_dispatcher(session_factory)
+    record_skipped_runs(scheduler, session_factory)
     scheduler.add_job(
-        run_competitor_check,
+        run_due_competitor_checks,
         "interval",
-        minutes=30,
+        minutes=1,
         args=[session_factory],
         id="competitor-checker",
         replace_existing=True,
     )
+    scheduler.add_job(
+        _run_post_retention,
+        "cron",
+        hour=3,
+        minute=30,
+        args=[session_factory],
+        id="competitor-post-retention",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        _run_metrics_refresh,
+        "interval",
+        minutes=refresh_interval_minutes(),
+        args=[session_factory],
+        id="post-metrics-refresh",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        _run_metrics_downsample,
+        "cron",
+        minute=5,
+        args=[session_factory],
+        id="post-metrics-downsample",
+        replace_existing=True,
+    )
     scheduler.start()
+
+
+def stop_competitor_checker() -> None:
+    if scheduler.running:
+        scheduler.shutdown()
+    close_http_client()
+    if _session_factory is not None:
+        stop_notification_dispatcher(_session_factory)
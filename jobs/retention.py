@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, Table, delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from db.maintenance import INCREMENTAL
+from services.archive import write_batch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_RETENTION_DAYS = {"trends": 30, "competitor_posts": 90}
+
+
+def _retention_days(table: Table) -> int:
+    return int(os.getenv(f"{table.name.upper()}_RETENTION_DAYS", DEFAULT_RETENTION_DAYS.get(table.name, 90)))
+
+
+def _batch_size() -> int:
+    return int(os.getenv("RETENTION_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+
+
+def _reclaim_space(engine: Engine) -> None:
+    """Return freed pages to the filesystem if the file uses incremental auto-vacuum."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != INCREMENTAL:
+            # Converting needs a full VACUUM, too long to hold the write lock from
+            # a scheduled job; freed pages are still reused for new rows.
+            logger.warning(
+                "%s does not use incremental auto-vacuum, so it will not shrink; "
+                "run `python -m db.maintenance enable-incremental-vacuum` while the app is stopped",
+                engine.url.database,
+            )
+            return
+        conn.exec_driver_sql("PRAGMA incremental_vacuum")
+        # In WAL mode the file only shrinks once the freed pages are checkpointed.
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def archive_and_prune(
+    session_factory: sessionmaker,
+    table: Table,
+    column: str,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+    keep: ColumnElement[bool] | None = None,
+) -> int:
+    """Move rows of ``table`` whose ``column`` is older than the retention window to Parquet.
+
+    Rows are archived and deleted in id order, ``RETENTION_BATCH_SIZE`` at a time,
+    committing after each batch so writers are never blocked for long. The window
+    defaults to ``<TABLE>_RETENTION_DAYS``; rows matching ``keep`` are never
+    archived. Returns the number of rows archived.
+    """
+    retention_days = retention_days or _retention_days(table)
+    batch_size = batch_size or _batch_size()
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    expired = table.c[column] < cutoff
+    if keep is not None:
+        expired &= ~keep
+
+    archived = 0
+    with session_factory() as db:
+        while True:
+            rows = db.execute(
+                select(table).where(expired).order_by(table.c.id).limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+
+            write_batch(table, [dict(row) for row in rows], column)
+            db.execute(delete(table).where(table.c.id.in_([row["id"] for row in rows])))
+            db.commit()
+            archived += len(rows)
+
+        engine = db.get_bind()
+
+    if archived:
+        _reclaim_space(engine)
+    logger.info("Archived %s %s rows older than %s days", archived, table.name, retention_days)
+    return archived
@@ -1,53 +1,105 @@
+import asyncio
+from collections.abc import Callable
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from models.database import SessionLocal
+from db.upsert import insert_for
+from models.database import SessionLocal, engine
+from models.job_run import JobRun
+from models.notification import NotificationOutbox
 from models.research import CompetitorPost, Trend
 from services.instagram_service import fetch_new_instagram_posts
-from services.telegram_service import send_telegram_notification
+from services.job_runs import JOB_DEFAULTS, record_skipped_runs, track_job_run
+from services.notification import (
+    enqueue_alert,
+    start_notification_dispatcher,
+    stop_notification_dispatcher,
+    wake_notification_dispatcher,
+)
+from services.seen_posts import SeenPostFilter
 from services.trends_service import collect_all_trending_topics
 
-scheduler = AsyncIOScheduler()
+scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
+seen_posts = SeenPostFilter.from_env()
 
 
-async def sync_trends() -> None:
+def _sync_trends() -> int:
     db: Session = SessionLocal()
     try:
         trends = collect_all_trending_topics()
-        for source, topics in trends.items():
-            for topic in topics:
-                db.add(Trend(source=source, topic=topic))
+        rows = [Trend(source=source, topic=topic) for source, topics in trends.items() for topic in topics]
+        db.add_all(rows)
         db.commit()
+        return len(rows)
     finally:
         db.close()
 
 
-async def monitor_competitors() -> None:
+def _monitor_competitors() -> int:
     db: Session = SessionLocal()
     try:
-        new_posts = fetch_new_instagram_posts()
-        for post in new_posts:
-            exists = db.query(CompetitorPost).filter_by(post_id=post["post_id"]).first()
-            if exists:
+        rows: dict[str, dict] = {}
+        for post in fetch_new_instagram_posts():
+            if post["post_id"] in seen_posts:
                 continue
-
-            db.add(
-                CompetitorPost(
-                    username=post["username"],
-                    post_id=post["post_id"],
-                    caption=post.get("caption"),
-                    post_url=post.get("post_url"),
-                )
-            )
-            await send_telegram_notification(
-                f"New post from @{post['username']}: {post.get('post_url', 'link unavailable')}"
+            rows.setdefault(
+                post["post_id"],
+                {
+                    "username": post["username"],
+                    "post_id": post["post_id"],
+                    "caption": post.get("caption"),
+                    "post_url": post.get("post_url"),
+                },
             )
+        if not rows:
+            return 0
+
+        stmt = insert_for(db, CompetitorPost).values(list(rows.values())).on_conflict_do_nothing()
+        inserted = db.execute(stmt.returning(CompetitorPost.username, CompetitorPost.post_url)).all()
+        for username, post_url in inserted:
+            link = post_url or "link unavailable"
+            enqueue_alert(db, username, f"New post from @{username}: {link}", summary=link)
         db.commit()
+        seen_posts.update(rows.keys())
+        if inserted:
+            wake_notification_dispatcher(SessionLocal)
+        return len(inserted)
     finally:
         db.close()
 
 
+def _run_tracked(job_id: str, job: Callable[[], int]) -> None:
+    with track_job_run(SessionLocal, job_id) as run:
+        run.item_count = job()
+
+
+# pytrends, praw, newsapi and the Instagram client are all blocking, as is the
+# session, so the work runs in a worker thread and the event loop keeps serving
+# requests while a job is in progress.
+async def sync_trends() -> None:
+    await asyncio.to_thread(_run_tracked, "sync_trends", _sync_trends)
+
+
+async def monitor_competitors() -> None:
+    await asyncio.to_thread(_run_tracked, "monitor_competitors", _monitor_competitors)
+
+
+def _warm_seen_posts() -> None:
+    with SessionLocal() as db:
+        post_ids = db.scalars(
+            select(CompetitorPost.post_id).order_by(CompetitorPost.id.desc()).limit(seen_posts.max_size)
+        ).all()
+    seen_posts.update(reversed(post_ids))
+
+
 def start_scheduler() -> None:
+    NotificationOutbox.__table__.create(bind=engine, checkfirst=True)
+    JobRun.__table__.create(bind=engine, checkfirst=True)
+    record_skipped_runs(scheduler, SessionLocal)
+    _warm_seen_posts()
+    start_notification_dispatcher(SessionLocal)
     scheduler.add_job(sync_trends, "interval", minutes=30, id="sync_trends", replace_existing=True)
     scheduler.add_job(
         monitor_competitors,
@@ -62,3 +114,4 @@ def start_scheduler() -> None:
 def stop_scheduler() -> None:
     if scheduler.running:
         scheduler.shutdown()
+    stop_notification_dispatcher(SessionLocal)
@@ -4,17 +4,26 @@ import logging
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from core.database import SessionLocal
+from core.database import SessionLocal, engine
+from jobs.retention import archive_and_prune
+from models.job_run import JobRun
+from models.trend import Trend
+from services.job_runs import JOB_DEFAULTS, record_skipped_runs, track_job_run
 from services.trend_aggregator import aggregate_trends
+from services.trend_cache import trend_cache
 
 logger = logging.getLogger(__name__)
-scheduler = AsyncIOScheduler()
+
+# Plain (non-async) jobs run on the event loop's default executor, so the
+# blocking source clients and SQLAlchemy calls never stall request handling.
+scheduler = AsyncIOScheduler(job_defaults=JOB_DEFAULTS)
 
 
 def _run_aggregation_job() -> None:
     db = SessionLocal()
     try:
-        aggregate_trends(db)
+        with track_job_run(SessionLocal, "trend_aggregation") as run:
+            run.item_count = len(aggregate_trends(db))
         logger.info("Trend aggregation completed")
     except Exception as exc:
         logger.exception("Trend aggregation failed: %s", exc)
@@ -22,11 +31,25 @@ def _run_aggregation_job() -> None:
         db.close()
 
 
+def _run_retention_job() -> None:
+    try:
+        with track_job_run(SessionLocal, "trend_retention") as run:
+            run.item_count = archive_and_prune(SessionLocal, Trend.__table__, "last_seen_at")
+        if run.item_count:
+            trend_cache.invalidate()
+    except Exception as exc:
+        logger.exception("Trend retention failed: %s", exc)
+
+
 def start_trend_scheduler() -> None:
     if scheduler.running:
         return
 
+    JobRun.__table__.create(bind=engine, checkfirst=True)
+    record_skipped_runs(scheduler, SessionLocal)
+
     scheduler.add_job(_run_aggregation_job, "interval", hours=4, id="trend_aggregation", replace_existing=True)
+    scheduler.add_job(_run_retention_job, "cron", hour=3, id="trend_retention", replace_existing=True)
     scheduler.start()
 
 
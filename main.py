@@ -38,9 +38,13 @@ from fastapi import FastAPI
 
 from api.trends import router as trends_router
 from core.database import Base, engine
+from db.migrations import upgrade_trends
 from jobs.trend_scheduler import start_trend_scheduler, stop_trend_scheduler
+from services.search import ensure_search_index
 
 Base.metadata.create_all(bind=engine)
+upgrade_trends(engine)
+ensure_search_index(engine)
 
 
 @asynccontextmanager
@@ -58,17 +62,25 @@ app.include_router(trends_router)
 from fastapi import FastAPI
 
 from api.competitors import router as competitors_router
+from api.search import router as search_router
 from database import SessionLocal, engine
-from jobs.competitor_checker import start_competitor_checker
+from jobs.competitor_checker import start_competitor_checker, stop_competitor_checker
 from models.base import Base
 
 app = FastAPI(title="Script Research Tool")
 app.include_router(competitors_router)
+app.include_router(search_router)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
     start_competitor_checker(SessionLocal)
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    stop_competitor_checker()
+
+
@@ -1,3 +1,6 @@
 from models.competitor import Competitor, CompetitorPost
+from models.job_run import JobRun
+from models.notification import NotificationOutbox
+from models.post_metric import PostMetric
 
-__all__ = ["Competitor", "CompetitorPost"]
+__all__ = ["Competitor", "CompetitorPost", "JobRun", "NotificationOutbox", "PostMetric"]
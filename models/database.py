@@ -1,18 +1,26 @@
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base
+
+from core.database import (
+    async_session_dependency,
+    async_session_factory,
+    create_async_db_engine,
+    create_db_engine,
+    session_dependency,
+    session_factory,
+)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./social_research.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_db_engine(DATABASE_URL)
+read_engine = create_db_engine(DATABASE_URL, read_only=True)
+async_read_engine = create_async_db_engine(DATABASE_URL, read_only=True)
+SessionLocal = session_factory(engine)
+ReadSessionLocal = session_factory(read_engine)
+AsyncReadSessionLocal = async_session_factory(async_read_engine)
 Base = declarative_base()
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+get_db = session_dependency(SessionLocal)
+get_read_db = session_dependency(ReadSessionLocal)
+get_async_read_db = async_session_dependency(AsyncReadSessionLocal)
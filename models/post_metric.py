@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, ForeignKey, Index, Integer, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from models.base import Base
+
+RAW = 0
+HOURLY = 1
+DAILY = 2
+
+
+class PostMetric(Base):
+    """Engagement sample of a competitor post: integers only, times in epoch seconds."""
+
+    __tablename__ = "post_metrics"
+    __table_args__ = (
+        Index("ix_post_metrics_competitor_sampled_at", "competitor_id", "sampled_at"),
+        Index("ix_post_metrics_resolution_sampled_at", "resolution", "sampled_at"),
+        {"sqlite_with_rowid": False},
+    )
+
+    post_id: Mapped[int] = mapped_column(
+        ForeignKey("competitor_posts.id", ondelete="CASCADE"), primary_key=True, autoincrement=False
+    )
+    sampled_at: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    resolution: Mapped[int] = mapped_column(SmallInteger, primary_key=True, autoincrement=False, default=RAW)
+    competitor_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    likes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    views: Mapped[int | None] = mapped_column(Integer, nullable=True)
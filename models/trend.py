@@ -1,19 +1,70 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.database import Base
 
 
+def normalize_topic(topic: str) -> str:
+    """The ``topic_key`` of ``topic``: lowercased with whitespace collapsed."""
+    return " ".join(topic.lower().split())
+
+
 class Trend(Base):
     __tablename__ = "trends"
+    __table_args__ = (
+        UniqueConstraint("source", "topic_key", name="uq_trends_source_topic_key"),
+        Index("ix_trends_fetched_at_id", "fetched_at", "id"),
+        Index("ix_trends_source_fetched_at_id", "source", "fetched_at", "id"),
+        Index("ix_trends_relevance_score_id", "relevance_score", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     source: Mapped[str] = mapped_column(String(50), index=True, nullable=False)
     topic: Mapped[str] = mapped_column(String(500), index=True, nullable=False)
+    topic_key: Mapped[str] = mapped_column(String(500), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     url: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     relevance_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    signal: Mapped[float | None] = mapped_column(Float, nullable=True)
+    published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
     niche_tags: Mapped[str | None] = mapped_column(Text, nullable=True)
+    first_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    seen_count: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+    cluster_id: Mapped[int | None] = mapped_column(Integer, index=True, nullable=True)
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+
+class TrendLshBucket(Base):
+    __tablename__ = "trend_lsh_buckets"
+
+    bucket_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    trend_id: Mapped[int] = mapped_column(
+        ForeignKey("trends.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class TrendRun(Base):
+    __tablename__ = "trend_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    trend_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_sources: Mapped[str | None] = mapped_column(Text, nullable=True)
+    timed_out_sources: Mapped[str | None] = mapped_column(Text, nullable=True)
+    failed_sources: Mapped[str | None] = mapped_column(Text, nullable=True)
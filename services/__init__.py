@@ -1,4 +1,10 @@
-from .instagram_monitor import fetch_recent_posts
-from .notification import send_new_post_alert
+from .instagram_monitor import fetch_new_posts_batch, fetch_recent_posts, fetch_recent_posts_batch
+from .notification import enqueue_alert, enqueue_new_post_alert
 
-__all__ = ["fetch_recent_posts", "send_new_post_alert"]
+__all__ = [
+    "fetch_new_posts_batch",
+    "fetch_recent_posts",
+    "fetch_recent_posts_batch",
+    "enqueue_alert",
+    "enqueue_new_post_alert",
+]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, Integer, LargeBinary, String, Table
+
+DEFAULT_ARCHIVE_DIR = "./archive"
+PARTITION_FIELD = "date"
+
+# Checked in order, so subclasses (BigInteger, Text) resolve before their bases.
+_ARROW_TYPES: list[tuple[type, pa.DataType]] = [
+    (Boolean, pa.bool_()),
+    (BigInteger, pa.int64()),
+    (Integer, pa.int64()),
+    (Float, pa.float64()),
+    (DateTime, pa.timestamp("us")),
+    (LargeBinary, pa.binary()),
+    (String, pa.string()),
+]
+
+
+def archive_root() -> Path:
+    return Path(os.getenv("ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR))
+
+
+def arrow_schema(table: Table) -> pa.Schema:
+    """Arrow schema for ``table``, fixed up front so every Parquet file in a partition agrees."""
+    fields = []
+    for column in table.columns:
+        arrow_type = next((t for sql_type, t in _ARROW_TYPES if isinstance(column.type, sql_type)), pa.string())
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+def write_batch(table: Table, rows: list[dict[str, Any]], partition_column: str) -> list[Path]:
+    """Append ``rows`` to ``<ARCHIVE_DIR>/<table>/date=YYYY-MM-DD/`` by the day of ``partition_column``.
+
+    Each call writes new files, so batches never rewrite earlier ones. Files are
+    written under a hidden temporary name and renamed, so readers never see a partial file.
+    """
+    schema = arrow_schema(table)
+    by_day: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_day[row[partition_column].date().isoformat()].append(row)
+
+    written = []
+    for day, day_rows in sorted(by_day.items()):
+        directory = archive_root() / table.name / f"{PARTITION_FIELD}={day}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        tmp_path = directory / f".{path.name}.tmp"
+        pq.write_table(pa.Table.from_pylist(day_rows, schema=schema), tmp_path)
+        os.replace(tmp_path, path)
+        written.append(path)
+    return written
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def read_archive(
+    table: Table,
+    partition_column: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    equals: dict[str, Any] | None = None,
+    limit: int = 100,
+) -> list[dict[str, Any]]:
+    """Archived rows of ``table`` newest first, filtered on ``partition_column`` and exact-match ``equals``.
+
+    Day partitions are read newest first, skipping those outside ``since``/``until``,
+    and reading stops once ``limit`` rows are collected.
+    """
+    directory = archive_root() / table.name
+    if not directory.exists():
+        return []
+
+    conditions = [ds.field(name) == value for name, value in (equals or {}).items()]
+    since_day = until_day = None
+    if since is not None:
+        since = _naive_utc(since)
+        since_day = since.date().isoformat()
+        conditions.append(ds.field(partition_column) >= pa.scalar(since, pa.timestamp("us")))
+    if until is not None:
+        until = _naive_utc(until)
+        until_day = until.date().isoformat()
+        conditions.append(ds.field(partition_column) < pa.scalar(until, pa.timestamp("us")))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    schema = arrow_schema(table)
+    columns = [column.name for column in table.columns]
+    rows: list[dict[str, Any]] = []
+    for day_directory in sorted(directory.glob(f"{PARTITION_FIELD}=*"), reverse=True):
+        day = day_directory.name.partition("=")[2]
+        if (since_day and day < since_day) or (until_day and day > until_day):
+            continue
+        # Files being written are hidden ``.name.tmp`` files, so they never match.
+        files = sorted(str(path) for path in day_directory.glob("*.parquet"))
+        if not files:
+            continue
+
+        result = ds.dataset(files, schema=schema, format="parquet").to_table(columns=columns, filter=expression)
+        result = result.sort_by([(partition_column, "descending"), ("id", "descending")])
+        rows.extend(result.slice(0, limit - len(rows)).to_pylist())
+        if len(rows) >= limit:
+            break
+    return rows
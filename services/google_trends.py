@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+import logging
 from typing import Any
 
 from pytrends.request import TrendReq
 
+from services.rate_limit import provider
+
+logger = logging.getLogger(__name__)
+
 
 def fetch_google_trends_india() -> list[dict[str, Any]]:
-    """Fetch realtime trending searches for India using pytrends."""
-    pytrends = TrendReq(hl="en-IN", tz=330)
+    """Fetch realtime trending searches for India using pytrends.
+
+    Falls back to the daily trending list, which has no traffic figures, when
+    the realtime feed fails; the fallback is logged so it does not go unnoticed.
+    """
+    limiter = provider("pytrends")
+    pytrends = limiter.call(TrendReq, hl="en-IN", tz=330)
 
     trends: list[dict[str, Any]] = []
 
     try:
-        realtime_df = pytrends.realtime_trending_searches(pn="IN")
+        realtime_df = limiter.call(pytrends.realtime_trending_searches, pn="IN")
         for _, row in realtime_df.iterrows():
             trends.append(
                 {
@@ -22,8 +32,9 @@ def fetch_google_trends_india() -> list[dict[str, Any]]:
                     "url": row.get("image", {}).get("newsUrl") if isinstance(row.get("image"), dict) else None,
                 }
             )
-    except Exception:
-        fallback_df = pytrends.trending_searches(pn="india")
+    except Exception as exc:
+        logger.warning("Google realtime trends failed, falling back to daily trending searches: %s", exc)
+        fallback_df = limiter.call(pytrends.trending_searches, pn="india")
         for _, row in fallback_df.iterrows():
             topic = str(row.iloc[0]).strip()
             trends.append(
@@ -1,19 +1,62 @@
 from __future__ import annotations
 
 import os
+import threading
+from collections.abc import Callable
 from datetime import datetime, timezone
 from typing import Any
 
-import requests
+import httpx
+
+from services.rate_limit import provider
 
 APIFY_BASE_URL = "https://api.apify.com/v2"
 ACTOR_ID = "apify/instagram-profile-scraper"
+REQUEST_TIMEOUT_SECONDS = 60
+PER_HANDLE_TIMEOUT_SECONDS = 10
+DEFAULT_LIMIT = 12
+DEFAULT_FIRST_PAGE_SIZE = 3
+DEFAULT_MAX_PAGE_SIZE = 48
+PAGE_GROWTH = 4
+
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
 
 
 class InstagramMonitorError(RuntimeError):
     pass
 
 
+def _client_options() -> dict[str, Any]:
+    return {
+        "base_url": APIFY_BASE_URL,
+        "timeout": REQUEST_TIMEOUT_SECONDS,
+        "limits": httpx.Limits(
+            max_connections=int(os.getenv("APIFY_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("APIFY_MAX_KEEPALIVE_CONNECTIONS", "10")),
+            keepalive_expiry=float(os.getenv("APIFY_KEEPALIVE_EXPIRY_SECONDS", "30")),
+        ),
+    }
+
+
+def get_http_client() -> httpx.Client:
+    """Return the shared, pooled client used for every Apify request in this process."""
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(**_client_options())
+        return _client
+
+
+def close_http_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
 def _parse_timestamp(value: Any) -> datetime | None:
     if value is None:
         return None
@@ -29,48 +72,141 @@ def _parse_timestamp(value: Any) -> datetime | None:
     return None
 
 
-def fetch_recent_posts(instagram_handle: str, limit: int = 12) -> list[dict[str, Any]]:
+def _parse_post(item: dict[str, Any]) -> dict[str, Any] | None:
+    post_url = item.get("url") or item.get("postUrl")
+    if not post_url:
+        return None
+
+    likes_count = item.get("likesCount") or item.get("likes")
+    views_count = item.get("videoViewCount") or item.get("videoPlayCount") or item.get("viewsCount")
+    post_type = item.get("type") or item.get("productType")
+    timestamp = _parse_timestamp(item.get("timestamp") or item.get("takenAt") or item.get("createdAt"))
+
+    return {
+        "post_url": post_url,
+        "caption": item.get("caption") or item.get("captionText") or "",
+        "post_type": post_type,
+        "timestamp": timestamp,
+        "likes_count": likes_count,
+        "views_count": views_count,
+        "is_pinned": bool(item.get("isPinned")),
+    }
+
+
+def _owner_handle(item: dict[str, Any]) -> str | None:
+    owner = item.get("ownerUsername") or item.get("username")
+    if not owner and isinstance(item.get("owner"), dict):
+        owner = item["owner"].get("username")
+    return owner.lstrip("@").lower() if owner else None
+
+
+def _run_actor(actor_input: dict[str, Any], api_key: str, timeout: float) -> httpx.Response:
+    response = get_http_client().post(
+        f"/acts/{ACTOR_ID}/run-sync-get-dataset-items",
+        params={"token": api_key, "clean": "true"},
+        json=actor_input,
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    return response
+
+
+def fetch_recent_posts_batch(
+    instagram_handles: list[str],
+    limit: int = DEFAULT_LIMIT,
+    newer_than: datetime | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """Fetch recent posts for several handles in a single actor run.
+
+    Returns a mapping of each requested handle (as given) to its posts. ``limit``
+    applies per handle, and handles the actor returned nothing for map to ``[]``.
+    With ``newer_than``, the actor skips posts published at or before it.
+    """
     api_key = os.getenv("APIFY_API_KEY")
     if not api_key:
         raise InstagramMonitorError("APIFY_API_KEY environment variable is not set")
 
+    handles = {handle.lstrip("@").lower(): handle for handle in instagram_handles}
+    if not handles:
+        return {}
+
     actor_input = {
-        "usernames": [instagram_handle.lstrip("@")],
+        "usernames": list(handles),
         "resultsLimit": limit,
         "resultsType": "posts",
         "searchType": "user",
         "addParentData": False,
     }
+    if newer_than is not None:
+        actor_input["onlyPostsNewerThan"] = newer_than.replace(microsecond=0).isoformat()
 
-    response = requests.post(
-        f"{APIFY_BASE_URL}/acts/{ACTOR_ID}/run-sync-get-dataset-items",
-        params={"token": api_key, "clean": "true"},
-        json=actor_input,
-        timeout=60,
+    response = provider("apify").call(
+        _run_actor, actor_input, api_key, REQUEST_TIMEOUT_SECONDS + PER_HANDLE_TIMEOUT_SECONDS * (len(handles) - 1)
     )
-    response.raise_for_status()
 
-    items = response.json()
-    posts: list[dict[str, Any]] = []
-    for item in items:
-        post_url = item.get("url") or item.get("postUrl")
-        if not post_url:
+    posts: dict[str, list[dict[str, Any]]] = {handle: [] for handle in handles.values()}
+    only_handle = next(iter(handles.values())) if len(handles) == 1 else None
+    for item in response.json():
+        post = _parse_post(item)
+        if post is None:
             continue
 
-        likes_count = item.get("likesCount") or item.get("likes")
-        views_count = item.get("videoViewCount") or item.get("videoPlayCount") or item.get("viewsCount")
-        post_type = item.get("type") or item.get("productType")
-        timestamp = _parse_timestamp(item.get("timestamp") or item.get("takenAt") or item.get("createdAt"))
-
-        posts.append(
-            {
-                "post_url": post_url,
-                "caption": item.get("caption") or item.get("captionText") or "",
-                "post_type": post_type,
-                "timestamp": timestamp,
-                "likes_count": likes_count,
-                "views_count": views_count,
-            }
-        )
+        owner = handles.get(_owner_handle(item) or "", only_handle)
+        if owner is None:
+            continue
+        posts[owner].append(post)
 
     return posts
+
+
+def _page_sizes() -> tuple[int, int]:
+    first = max(1, int(os.getenv("INSTAGRAM_FIRST_PAGE_SIZE", DEFAULT_FIRST_PAGE_SIZE)))
+    return first, max(first, int(os.getenv("INSTAGRAM_MAX_PAGE_SIZE", DEFAULT_MAX_PAGE_SIZE)))
+
+
+def fetch_new_posts_batch(
+    instagram_handles: list[str],
+    is_known: Callable[[str], bool],
+    newest_posted_at: dict[str, datetime | None],
+) -> dict[str, list[dict[str, Any]]]:
+    """Each handle's posts that ``is_known`` does not know and, when dated, newer than its newest stored post."""
+    first_page, max_page = _page_sizes()
+    new_posts: dict[str, list[dict[str, Any]]] = {handle: [] for handle in instagram_handles}
+
+    # Handles with no stored posts get one regular fetch rather than a backfill of the whole profile.
+    fresh = [handle for handle in instagram_handles if newest_posted_at.get(handle) is None]
+    if fresh:
+        for handle, posts in fetch_recent_posts_batch(fresh, limit=DEFAULT_LIMIT).items():
+            new_posts[handle] = [post for post in posts if not is_known(post["post_url"])]
+
+    pending = [handle for handle in instagram_handles if newest_posted_at.get(handle) is not None]
+    limit = first_page
+    while pending:
+        # One actor run covers the whole chunk, so the cut-off is the oldest of
+        # the handles' newest posts; each handle's own cut-off is applied below.
+        newer_than = min(newest_posted_at[handle] for handle in pending)
+        results = fetch_recent_posts_batch(pending, limit=limit, newer_than=newer_than)
+
+        grow = []
+        for handle in pending:
+            posts = results.get(handle, [])
+            cutoff = newest_posted_at[handle]
+            new_posts[handle] = [
+                post
+                for post in posts
+                if not is_known(post["post_url"]) and (post["timestamp"] is None or post["timestamp"] > cutoff)
+            ]
+            # Past a known unpinned post everything is known, so only full, all-new pages grow.
+            reached_known = any(is_known(post["post_url"]) for post in posts if not post["is_pinned"])
+            if len(posts) >= limit and not reached_known:
+                grow.append(handle)
+
+        if limit >= max_page:
+            break
+        pending, limit = grow, min(limit * PAGE_GROWTH, max_page)
+
+    return new_posts
+
+
+def fetch_recent_posts(instagram_handle: str, limit: int = DEFAULT_LIMIT) -> list[dict[str, Any]]:
+    return fetch_recent_posts_batch([instagram_handle], limit=limit)[instagram_handle]
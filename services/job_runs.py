@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from apscheduler.events import EVENT_JOB_MAX_INSTANCES, JobSubmissionEvent
+from apscheduler.schedulers.base import BaseScheduler
+from sqlalchemy.orm import sessionmaker
+
+from models.job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = "success"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Shared by every scheduler: a job never overlaps itself, and runs missed while
+# it was busy collapse into a single catch-up run.
+JOB_DEFAULTS = {"max_instances": 1, "coalesce": True}
+
+
+@dataclass
+class RunStats:
+    item_count: int | None = None
+
+
+def _save(session_factory: sessionmaker, run: JobRun) -> None:
+    try:
+        with session_factory() as db:
+            db.add(run)
+            db.commit()
+    except Exception:
+        logger.exception("Failed to record %s run of %s", run.status, run.job_id)
+
+
+@contextmanager
+def track_job_run(session_factory: sessionmaker, job_id: str) -> Iterator[RunStats]:
+    """Record the wrapped job run in ``job_runs``: duration, outcome and ``item_count``.
+
+    The job sets ``item_count`` on the yielded stats. Exceptions are recorded and
+    re-raised; a failure to write the record is only logged.
+    """
+    stats = RunStats()
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+    status, error = SUCCESS, None
+    try:
+        yield stats
+    except Exception as exc:
+        status, error = FAILED, repr(exc)
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        logger.info("Job %s finished with %s in %.1fs (%s items)", job_id, status, duration, stats.item_count)
+        _save(
+            session_factory,
+            JobRun(
+                job_id=job_id,
+                status=status,
+                started_at=started_at,
+                finished_at=datetime.utcnow(),
+                duration_seconds=duration,
+                item_count=stats.item_count,
+                error=error,
+            ),
+        )
+
+
+def record_skipped_runs(scheduler: BaseScheduler, session_factory: sessionmaker) -> None:
+    """Record a ``skipped`` run whenever a job fires while its previous run is still going."""
+
+    def on_max_instances(event: JobSubmissionEvent) -> None:
+        logger.warning("Skipped %s: previous run still in progress", event.job_id)
+        _save(session_factory, JobRun(job_id=event.job_id, status=SKIPPED, started_at=datetime.utcnow()))
+
+    scheduler.add_listener(on_max_instances, EVENT_JOB_MAX_INSTANCES)
+
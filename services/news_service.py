@@ -5,6 +5,8 @@ from typing import Any
 
 from newsapi import NewsApiClient
 
+from services.rate_limit import provider
+
 INDIA_CATEGORIES = ["technology", "business", "entertainment"]
 
 
@@ -30,13 +32,14 @@ def fetch_india_headlines() -> list[dict[str, Any]]:
         raise ValueError("NEWSAPI_KEY is not set")
 
     newsapi = NewsApiClient(api_key=api_key)
+    limiter = provider("newsapi")
 
     all_articles: list[dict[str, Any]] = []
-    general = newsapi.get_top_headlines(country="in", page_size=100)
+    general = limiter.call(newsapi.get_top_headlines, country="in", page_size=100)
     all_articles.extend(_map_articles(general.get("articles", [])))
 
     for category in INDIA_CATEGORIES:
-        category_result = newsapi.get_top_headlines(country="in", category=category, page_size=100)
+        category_result = limiter.call(newsapi.get_top_headlines, country="in", category=category, page_size=100)
         for item in _map_articles(category_result.get("articles", [])):
             item["category"] = category
             all_articles.append(item)
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 import os
-from datetime import datetime, timezone
+import random
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, sessionmaker
 from telegram import Bot
+from telegram.error import RetryAfter
 
 from models.competitor import CompetitorPost
+from models.notification import NotificationOutbox
+from services.rate_limit import ProviderUnavailable, provider
 
+logger = logging.getLogger(__name__)
 
-async def _send_message(text: str) -> None:
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
-    if not token or not chat_id:
-        raise RuntimeError("TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID must be set")
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
 
-    bot = Bot(token=token)
-    await bot.send_message(chat_id=chat_id, text=text)
+TELEGRAM_MESSAGE_LIMIT = 4096
+RETRY_BASE_SECONDS = 15.0
+RETRY_MAX_SECONDS = 900.0
+
+_dispatchers: dict[str, NotificationDispatcher] = {}
+_dispatchers_lock = threading.Lock()
 
 
 def _time_ago(value: datetime | None) -> str:
@@ -35,21 +48,283 @@ def _time_ago(value: datetime | None) -> str:
     return f"{days}d ago"
 
 
-def send_new_post_alert(post: CompetitorPost) -> None:
+def format_new_post_alert(post: CompetitorPost) -> str:
     handle = post.competitor.instagram_handle if post.competitor else "unknown"
     post_kind = (post.post_type or "Post").title()
     caption = (post.caption or "").strip()
     preview = caption[:100] + ("..." if len(caption) > 100 else "")
 
-    message = (
+    return (
         f"🚨 New {post_kind} from @{handle}!\n"
         f"Caption: {preview or '[no caption]'}\n"
         f"Link: {post.post_url}\n"
         f"Posted: {_time_ago(post.posted_at)}"
     )
 
-    try:
-        asyncio.run(_send_message(message))
-    except RuntimeError:
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(_send_message(message))
+
+def enqueue_alert(db: Session, group_key: str, message: str, summary: str | None = None) -> NotificationOutbox:
+    """Add an alert to the outbox as part of the caller's transaction.
+
+    Pending alerts that share a ``group_key`` are merged into one message when
+    the dispatcher sends them, using ``summary`` as the line for each alert.
+    """
+    entry = NotificationOutbox(group_key=group_key, message=message, summary=summary, status=PENDING)
+    db.add(entry)
+    return entry
+
+
+def enqueue_new_post_alert(db: Session, post: CompetitorPost) -> NotificationOutbox:
+    handle = post.competitor.instagram_handle if post.competitor else "unknown"
+    post_kind = (post.post_type or "Post").title()
+    return enqueue_alert(db, handle, format_new_post_alert(post), summary=f"{post_kind}: {post.post_url}")
+
+
+def _merge_messages(group_key: str, entries: list[NotificationOutbox]) -> str:
+    if len(entries) == 1:
+        text = entries[0].message
+    else:
+        lines = [f"🚨 {len(entries)} new posts from @{group_key}!"]
+        lines.extend(f"• {entry.summary or entry.message}" for entry in entries)
+        text = "\n".join(lines)
+
+    if len(text) > TELEGRAM_MESSAGE_LIMIT:
+        text = text[: TELEGRAM_MESSAGE_LIMIT - 3] + "..."
+    return text
+
+
+def _retry_delay(attempts: int) -> float:
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _retry_after_seconds(exc: RetryAfter) -> float:
+    retry_after = exc.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class NotificationDispatcher:
+    """Drain the notification outbox to Telegram from a single background thread.
+
+    One ``Bot`` is reused for the lifetime of the dispatcher. Sends to the chat
+    are spaced at least ``TELEGRAM_MIN_SEND_INTERVAL_SECONDS`` apart, Telegram's
+    ``RetryAfter`` is honoured, and other failures are retried with jittered
+    exponential backoff until ``NOTIFICATION_MAX_ATTEMPTS`` is reached.
+    """
+
+    def __init__(self, session_factory: sessionmaker, token: str, chat_id: str) -> None:
+        self._session_factory = session_factory
+        self._token = token
+        self.chat_id = chat_id
+        self.poll_interval = float(os.getenv("NOTIFICATION_POLL_INTERVAL_SECONDS", "5"))
+        self.min_send_interval = float(os.getenv("TELEGRAM_MIN_SEND_INTERVAL_SECONDS", "1"))
+        self.max_attempts = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+        self.batch_size = int(os.getenv("NOTIFICATION_BATCH_SIZE", "100"))
+
+        self._next_send_at = 0.0
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self) -> None:
+        """Ask the dispatcher to look at the outbox now instead of at the next poll."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            async with Bot(token=self._token) as bot:
+                while not self._stopping.is_set():
+                    try:
+                        claimed = await self.dispatch_pending(bot)
+                    except Exception:
+                        logger.exception("Notification dispatch failed")
+                        claimed = 0
+
+                    if claimed >= self.batch_size:
+                        continue
+
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            self._loop = None
+            self._wakeup = None
+
+    def _due_entries(self) -> list[NotificationOutbox]:
+        with self._session_factory() as db:
+            entries = db.scalars(
+                select(NotificationOutbox)
+                .where(
+                    NotificationOutbox.status == PENDING,
+                    NotificationOutbox.next_attempt_at <= datetime.utcnow(),
+                )
+                .order_by(NotificationOutbox.id)
+                .limit(self.batch_size)
+            ).all()
+            db.expunge_all()
+            return list(entries)
+
+    def _mark_sent(self, entries: Iterable[NotificationOutbox]) -> None:
+        with self._session_factory() as db:
+            db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_([entry.id for entry in entries]))
+                .values(status=SENT, sent_at=datetime.utcnow(), last_error=None)
+            )
+            db.commit()
+
+    def _mark_failed(self, entries: Iterable[NotificationOutbox], error: str, retry_in: float | None) -> None:
+        now = datetime.utcnow()
+        changes = []
+        for entry in entries:
+            attempts = entry.attempts + 1
+            exhausted = retry_in is None and attempts >= self.max_attempts
+            delay = retry_in if retry_in is not None else _retry_delay(attempts)
+            changes.append(
+                {
+                    "id": entry.id,
+                    "attempts": attempts,
+                    "status": FAILED if exhausted else PENDING,
+                    "next_attempt_at": now + timedelta(seconds=delay),
+                    "last_error": error[:1000],
+                }
+            )
+
+        with self._session_factory() as db:
+            db.execute(update(NotificationOutbox), changes)
+            db.commit()
+
+    def _reschedule(self, entries: Iterable[NotificationOutbox], retry_in: float) -> None:
+        """Push ``entries`` back by ``retry_in`` seconds without counting an attempt."""
+        with self._session_factory() as db:
+            db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_([entry.id for entry in entries]))
+                .values(next_attempt_at=datetime.utcnow() + timedelta(seconds=retry_in))
+            )
+            db.commit()
+
+    async def _throttle(self) -> None:
+        delay = self._next_send_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def dispatch_pending(self, bot: Bot) -> int:
+        """Send every due outbox entry, one merged message per ``group_key``.
+
+        Returns the number of entries claimed from the outbox.
+        """
+        entries = self._due_entries()
+
+        groups: dict[str, list[NotificationOutbox]] = {}
+        for entry in entries:
+            groups.setdefault(entry.group_key, []).append(entry)
+
+        for group_key, group in groups.items():
+            if self._stopping.is_set():
+                break
+
+            await self._throttle()
+            try:
+                await provider("telegram").acall(
+                    bot.send_message, chat_id=self.chat_id, text=_merge_messages(group_key, group)
+                )
+            except ProviderUnavailable as exc:
+                # Never sent, so the attempt does not count towards NOTIFICATION_MAX_ATTEMPTS.
+                self._reschedule(group, exc.retry_in)
+                continue
+            except RetryAfter as exc:
+                retry_in = _retry_after_seconds(exc)
+                self._next_send_at = time.monotonic() + retry_in
+                self._mark_failed(group, str(exc), retry_in)
+                continue
+            except Exception as exc:
+                logger.warning("Telegram send for %s failed: %s", group_key, exc)
+                self._next_send_at = time.monotonic() + self.min_send_interval
+                self._mark_failed(group, str(exc), None)
+                continue
+
+            self._next_send_at = time.monotonic() + self.min_send_interval
+            self._mark_sent(group)
+
+        return len(entries)
+
+
+def _database_key(session_factory: sessionmaker) -> str:
+    bind = session_factory.kw.get("bind")
+    return bind.url.render_as_string(hide_password=True) if bind is not None else repr(session_factory)
+
+
+def start_notification_dispatcher(session_factory: sessionmaker) -> NotificationDispatcher | None:
+    """Start the dispatcher for ``session_factory``'s database if it is not already running.
+
+    Each database has its own outbox, so each gets its own dispatcher.
+    """
+    key = _database_key(session_factory)
+    with _dispatchers_lock:
+        dispatcher = _dispatchers.get(key)
+        if dispatcher is not None and dispatcher.running:
+            return dispatcher
+
+        token = os.getenv("TELEGRAM_BOT_TOKEN")
+        chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        if not token or not chat_id:
+            logger.warning("TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID must be set; alerts will stay queued")
+            return None
+
+        dispatcher = _dispatchers[key] = NotificationDispatcher(session_factory, token, chat_id)
+        dispatcher.start()
+        return dispatcher
+
+
+def _selected(session_factory: sessionmaker | None) -> list[NotificationDispatcher]:
+    with _dispatchers_lock:
+        if session_factory is None:
+            return list(_dispatchers.values())
+        dispatcher = _dispatchers.get(_database_key(session_factory))
+        return [dispatcher] if dispatcher is not None else []
+
+
+def wake_notification_dispatcher(session_factory: sessionmaker | None = None) -> None:
+    """Wake the dispatcher of ``session_factory``'s database, or every dispatcher."""
+    for dispatcher in _selected(session_factory):
+        dispatcher.wake()
+
+
+def stop_notification_dispatcher(session_factory: sessionmaker | None = None) -> None:
+    """Stop the dispatcher of ``session_factory``'s database, or every dispatcher."""
+    for dispatcher in _selected(session_factory):
+        dispatcher.stop()
+        with _dispatchers_lock:
+            for key, running in list(_dispatchers.items()):
+                if running is dispatcher:
+                    del _dispatchers[key]
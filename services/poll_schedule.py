@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import heapq
+import os
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.competitor import Competitor, CompetitorPost
+
+HISTORY_POSTS = 20
+POLLS_PER_GAP = 4
+JITTER_FRACTION = 0.1
+DEFAULT_INTERVAL = timedelta(minutes=30)
+DEFAULT_MIN_INTERVAL_MINUTES = 15
+DEFAULT_MAX_INTERVAL_HOURS = 24
+
+
+def _min_interval() -> timedelta:
+    return timedelta(minutes=float(os.getenv("COMPETITOR_POLL_MIN_MINUTES", DEFAULT_MIN_INTERVAL_MINUTES)))
+
+
+def _max_interval() -> timedelta:
+    return timedelta(hours=float(os.getenv("COMPETITOR_POLL_MAX_HOURS", DEFAULT_MAX_INTERVAL_HOURS)))
+
+
+def estimate_interval(posted_at: list[datetime], now: datetime) -> timedelta:
+    """How long to wait between checks of an account with the given post times.
+
+    The account is checked ``POLLS_PER_GAP`` times per average gap between its
+    recent posts. Once it is overdue, the gap is taken as half the time since its
+    last post, so dormant accounts back off gradually. Accounts with fewer than
+    two dated posts get ``DEFAULT_INTERVAL``.
+    """
+    times = sorted(posted_at)
+    if len(times) < 2:
+        return max(_min_interval(), min(DEFAULT_INTERVAL, _max_interval()))
+
+    mean_gap = (times[-1] - times[0]) / (len(times) - 1)
+    expected_gap = max(mean_gap, (now - times[-1]) / 2)
+    return max(_min_interval(), min(expected_gap / POLLS_PER_GAP, _max_interval()))
+
+
+def recent_post_times(db: Session, competitor_ids: list[int]) -> dict[int, list[datetime]]:
+    """The last ``HISTORY_POSTS`` ``posted_at`` values of each competitor, in one query."""
+    ranked = (
+        select(
+            CompetitorPost.competitor_id,
+            CompetitorPost.posted_at,
+            func.row_number()
+            .over(partition_by=CompetitorPost.competitor_id, order_by=CompetitorPost.posted_at.desc())
+            .label("rank"),
+        )
+        .where(CompetitorPost.competitor_id.in_(competitor_ids), CompetitorPost.posted_at.is_not(None))
+        .subquery()
+    )
+    history: dict[int, list[datetime]] = defaultdict(list)
+    for competitor_id, posted_at in db.execute(
+        select(ranked.c.competitor_id, ranked.c.posted_at).where(ranked.c.rank <= HISTORY_POSTS)
+    ):
+        history[competitor_id].append(posted_at)
+    return history
+
+
+class PollQueue:
+    """Min-heap of competitors keyed on when each is next due for a check.
+
+    Entries are replaced lazily: rescheduling pushes a new entry and the old one
+    is dropped when it reaches the top, so every operation is ``O(log n)``.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int]] = []
+        self._due: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._due)
+
+    def _push(self, competitor_id: int, due_at: datetime) -> None:
+        self._due[competitor_id] = due_at
+        heapq.heappush(self._heap, (due_at, competitor_id))
+
+    def schedule(self, db: Session, competitor_ids: list[int], now: datetime, checked: bool = False) -> None:
+        """(Re)compute the next check of ``competitor_ids`` from their post history.
+
+        The interval counts from ``now`` when ``checked`` (just attempted, even if
+        the fetch failed), otherwise from ``last_checked_at``; never-checked
+        competitors are due immediately.
+        """
+        if not competitor_ids:
+            return
+
+        history = recent_post_times(db, competitor_ids)
+        last_checked = dict(
+            db.execute(
+                select(Competitor.id, Competitor.last_checked_at).where(Competitor.id.in_(competitor_ids))
+            ).all()
+        )
+        with self._lock:
+            for competitor_id in competitor_ids:
+                if competitor_id not in last_checked:
+                    self._due.pop(competitor_id, None)
+                    continue
+                interval = estimate_interval(history.get(competitor_id, []), now)
+                # Jitter keeps accounts added together from staying in lockstep.
+                interval *= 1 + random.uniform(-JITTER_FRACTION, JITTER_FRACTION)
+                checked_at = now if checked else last_checked[competitor_id]
+                self._push(competitor_id, checked_at + interval if checked_at else now)
+
+    def sync(self, db: Session, now: datetime) -> None:
+        """Add competitors created since the last sync and forget deleted ones."""
+        ids = set(db.scalars(select(Competitor.id)))
+        with self._lock:
+            for competitor_id in self._due.keys() - ids:
+                del self._due[competitor_id]
+            new_ids = sorted(ids - self._due.keys())
+        self.schedule(db, new_ids, now)
+
+    def pop_due(self, now: datetime, limit: int) -> list[int]:
+        """Remove and return up to ``limit`` competitors that are due, most overdue first."""
+        due: list[int] = []
+        with self._lock:
+            while self._heap and len(due) < limit and self._heap[0][0] <= now:
+                due_at, competitor_id = heapq.heappop(self._heap)
+                if self._due.get(competitor_id) != due_at:
+                    continue
+                del self._due[competitor_id]
+                due.append(competitor_id)
+        return due
+
+    def next_due(self) -> datetime | None:
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
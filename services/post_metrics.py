@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.orm import Session
+
+from db.upsert import insert_for
+from models.competitor import CompetitorPost
+from models.post_metric import DAILY, HOURLY, RAW, PostMetric
+
+DEFAULT_TRACK_HOURS = 72
+DEFAULT_REFRESH_MINUTES = 60
+DEFAULT_RAW_HOURS = 48
+DEFAULT_HOURLY_DAYS = 30
+
+BUCKET_SECONDS = {HOURLY: 3600, DAILY: 86400}
+
+
+def track_window() -> timedelta:
+    """How long after being posted a post keeps getting engagement samples."""
+    return timedelta(hours=float(os.getenv("POST_METRICS_TRACK_HOURS", DEFAULT_TRACK_HOURS)))
+
+
+def refresh_interval_minutes() -> float:
+    return float(os.getenv("POST_METRICS_REFRESH_MINUTES", DEFAULT_REFRESH_MINUTES))
+
+
+def _raw_age() -> timedelta:
+    return timedelta(hours=float(os.getenv("POST_METRICS_RAW_HOURS", DEFAULT_RAW_HOURS)))
+
+
+def _hourly_age() -> timedelta:
+    return timedelta(days=float(os.getenv("POST_METRICS_HOURLY_DAYS", DEFAULT_HOURLY_DAYS)))
+
+
+def epoch(value: datetime) -> int:
+    """Naive UTC ``datetime`` to epoch seconds, the unit of ``sampled_at``."""
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+def _count(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def sample_rows(
+    competitor_id: int,
+    posts: Iterable[dict[str, Any]],
+    post_id_for: Callable[[str], int | None],
+    sampled_at: datetime,
+) -> list[dict[str, int | None]]:
+    """``post_metrics`` rows for the fetched ``posts`` that are stored and carry any engagement.
+
+    ``post_id_for`` maps a post URL to its ``competitor_posts.id``, or ``None``.
+    """
+    rows: dict[int, dict[str, int | None]] = {}
+    for payload in posts:
+        post_id = post_id_for(payload["post_url"])
+        likes, views = _count(payload.get("likes_count")), _count(payload.get("views_count"))
+        if post_id is None or (likes is None and views is None):
+            continue
+        rows[post_id] = {
+            "post_id": post_id,
+            "sampled_at": epoch(sampled_at),
+            "resolution": RAW,
+            "competitor_id": competitor_id,
+            "likes": likes,
+            "views": views,
+        }
+    return list(rows.values())
+
+
+def tracked_posts(db: Session, since: datetime) -> dict[int, dict[str, int]]:
+    """``{competitor_id: {post_url: post_id}}`` of the stored posts published since ``since``."""
+    tracked: dict[int, dict[str, int]] = defaultdict(dict)
+    for post_id, competitor_id, post_url in db.execute(
+        select(CompetitorPost.id, CompetitorPost.competitor_id, CompetitorPost.post_url).where(
+            CompetitorPost.posted_at >= since
+        )
+    ):
+        tracked[competitor_id][post_url] = post_id
+    return tracked
+
+
+def save_samples(db: Session, rows: list[dict[str, int | None]]) -> None:
+    """Write a check cycle's samples in one multi-row INSERT; repeats of a (post, second) are dropped."""
+    if rows:
+        db.execute(insert_for(db, PostMetric).on_conflict_do_nothing(), rows)
+
+
+def _rollup(db: Session, source: int, target: int, older_than: datetime) -> int:
+    """Fold ``source`` samples older than ``older_than`` into ``target`` buckets and delete them.
+
+    The cut-off is rounded down to a bucket boundary so a bucket is only ever
+    built once, from all of its samples. Each bucket keeps the highest count seen
+    in it, which for cumulative likes/views is the last one.
+    """
+    size = BUCKET_SECONDS[target]
+    cutoff = epoch(older_than) // size * size
+    bucket = PostMetric.sampled_at // size * size
+    rows = (
+        select(
+            PostMetric.post_id,
+            bucket,
+            literal(target),
+            PostMetric.competitor_id,
+            func.max(PostMetric.likes),
+            func.max(PostMetric.views),
+        )
+        .where(PostMetric.resolution == source, PostMetric.sampled_at < cutoff)
+        .group_by(PostMetric.post_id, bucket, PostMetric.competitor_id)
+    )
+    insert = insert_for(db, PostMetric).from_select(
+        ["post_id", "sampled_at", "resolution", "competitor_id", "likes", "views"], rows
+    )
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["post_id", "sampled_at", "resolution"],
+            set_={"likes": insert.excluded.likes, "views": insert.excluded.views},
+        )
+    )
+    result = db.execute(
+        delete(PostMetric).where(PostMetric.resolution == source, PostMetric.sampled_at < cutoff)
+    )
+    return result.rowcount
+
+
+def downsample(db: Session, now: datetime | None = None) -> int:
+    """Roll raw samples older than ``POST_METRICS_RAW_HOURS`` into hourly points and
+    hourly points older than ``POST_METRICS_HOURLY_DAYS`` into daily ones.
+
+    Commits and returns the number of rows folded away.
+    """
+    now = now or datetime.utcnow()
+    folded = _rollup(db, RAW, HOURLY, now - _raw_age())
+    folded += _rollup(db, HOURLY, DAILY, now - _hourly_age())
+    db.commit()
+    return folded
+
+
+def velocity_curve(points: Iterable[PostMetric]) -> list[dict[str, Any]]:
+    """Per-hour change of likes and views between consecutive samples of one post.
+
+    ``points`` must be ordered by ``sampled_at``. The first point, and any
+    count missing on either side of a step, has no velocity.
+    """
+    curve: list[dict[str, Any]] = []
+    previous: PostMetric | None = None
+    for point in points:
+        likes_per_hour = views_per_hour = None
+        if previous is not None and point.sampled_at > previous.sampled_at:
+            hours = (point.sampled_at - previous.sampled_at) / 3600
+            if point.likes is not None and previous.likes is not None:
+                likes_per_hour = (point.likes - previous.likes) / hours
+            if point.views is not None and previous.views is not None:
+                views_per_hour = (point.views - previous.views) / hours
+        curve.append(
+            {
+                "sampled_at": datetime.utcfromtimestamp(point.sampled_at),
+                "resolution": point.resolution,
+                "likes": point.likes,
+                "views": point.views,
+                "likes_per_hour": likes_per_hour,
+                "views_per_hour": views_per_hour,
+            }
+        )
+        previous = point
+    return curve
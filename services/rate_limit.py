@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# (calls per minute, burst) per provider, sized to each API's published quota.
+DEFAULT_QUOTAS: dict[str, tuple[float, int]] = {
+    "apify": (30, 5),
+    "newsapi": (100 / (24 * 60), 8),  # Developer plan: 100 requests a day.
+    "reddit": (100, 10),  # OAuth clients: 100 queries a minute.
+    "pytrends": (6, 2),  # Unofficial endpoint; Google starts answering 429 above a few a minute.
+    "telegram": (20, 3),  # Bots get 20 messages a minute in a group chat.
+}
+# Telegram sends are retried by the notification outbox, so the limiter only tries once.
+DEFAULT_MAX_ATTEMPTS = {"telegram": 1}
+DEFAULT_MAX_ATTEMPTS_FALLBACK = 3
+# Calls that start paid work upstream: a call that may have reached the
+# provider (read timeout, 5xx) is not repeated, since each Apify
+# run-sync request starts another actor run.
+NON_IDEMPOTENT = {"apify"}
+DEFAULT_MAX_WAIT_SECONDS = 30.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 60.0
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# NewsAPI reports throttling and outages as error codes instead of HTTP statuses.
+_NEWSAPI_RETRY_CODES = {"rateLimited": 429, "unexpectedError": 500}
+
+
+class ProviderUnavailable(RuntimeError):
+    """The call was not made: the provider's circuit is open or its quota is used up.
+
+    ``retry_in`` is how many seconds until a call may succeed.
+    """
+
+    def __init__(self, provider: str, reason: str, retry_in: float) -> None:
+        super().__init__(f"{provider} unavailable: {reason}, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def _env_name(provider: str, setting: str) -> str:
+    return f"RATE_LIMIT_{provider.upper()}_{setting}"
+
+
+def _status_code(exc: BaseException) -> int | None:
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status
+    get_code = getattr(exc, "get_code", None)
+    if callable(get_code):
+        return _NEWSAPI_RETRY_CODES.get(get_code())
+    return None
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """429s, 5xx responses and network errors are worth retrying; anything else is not."""
+    if getattr(exc, "retry_after", None) is not None:
+        return True
+    status = _status_code(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, (httpx.TransportError, OSError)) or type(exc).__name__ in {"NetworkError", "TimedOut"}
+
+
+def _never_sent(exc: BaseException) -> bool:
+    """Failures where the provider did no work: no connection was made, or it answered 429."""
+    return isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)) or _status_code(exc) == 429
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        retry_after = headers.get("Retry-After")
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens a second, holding at most ``capacity``.
+
+    Callers reserve a token and then sleep for the returned wait outside the
+    lock, so sync and async callers share one bucket and queue up fairly.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait(self, now: float) -> float:
+        return max((1 - self._tokens) / self.rate, self._blocked_until - now, 0.0)
+
+    def reserve(self, max_wait: float) -> float | None:
+        """Take a token and return how long to wait before using it, or ``None`` if that exceeds ``max_wait``."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait(now)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is free."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._wait(now)
+
+    def block(self, seconds: float) -> None:
+        """Hand out no tokens for ``seconds``, e.g. after the provider answered 429."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Stop calling a provider after ``failure_threshold`` failures in a row.
+
+    While open, calls are refused immediately. After ``reset_seconds`` one trial
+    call is let through (half-open): success closes the circuit again, failure
+    reopens it for another ``reset_seconds``.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> float:
+        """Return 0 to let a call through, otherwise the seconds until one may be made."""
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            now = time.monotonic()
+            remaining = self._opened_at + self.reset_seconds - now
+            if remaining > 0:
+                return remaining
+            # Let one trial call through and hold everyone else for another period.
+            self.state, self._opened_at = HALF_OPEN, now
+            return 0.0
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(self._opened_at + self.reset_seconds - time.monotonic(), 0.0)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state, self.failures = CLOSED, 0
+
+    def record_failure(self) -> bool:
+        """Count a failure; returns whether it opened the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                opened = self.state != OPEN
+                self.state, self._opened_at = OPEN, time.monotonic()
+                return opened
+            return False
+
+
+class Provider:
+    """Rate limit, retry and circuit breaker for one external API.
+
+    Use :meth:`call` from threads and :meth:`acall` on an event loop; both share
+    the same bucket and breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        per_minute: float,
+        burst: int,
+        max_attempts: int,
+        max_wait: float,
+        failure_threshold: int,
+        reset_seconds: float,
+        idempotent: bool = True,
+    ) -> None:
+        self.name = name
+        self.idempotent = idempotent
+        self.bucket = TokenBucket(per_minute / 60, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.max_attempts = max_attempts
+        self.max_wait = max_wait
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> Provider:
+        per_minute, burst = DEFAULT_QUOTAS.get(name, (60, 5))
+        max_attempts = DEFAULT_MAX_ATTEMPTS.get(name, DEFAULT_MAX_ATTEMPTS_FALLBACK)
+        return cls(
+            name,
+            per_minute=float(os.getenv(_env_name(name, "PER_MINUTE"), per_minute)),
+            burst=max(1, int(os.getenv(_env_name(name, "BURST"), burst))),
+            max_attempts=max(1, int(os.getenv(_env_name(name, "MAX_ATTEMPTS"), max_attempts))),
+            max_wait=float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", DEFAULT_MAX_WAIT_SECONDS)),
+            failure_threshold=int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD)),
+            reset_seconds=float(os.getenv("CIRCUIT_RESET_SECONDS", DEFAULT_RESET_SECONDS)),
+            idempotent=name not in NON_IDEMPOTENT,
+        )
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _admit(self) -> float:
+        """Check the breaker and take a token; returns the wait before calling."""
+        retry_in = self.breaker.allow()
+        if retry_in > 0:
+            self._count("rejected")
+            raise ProviderUnavailable(self.name, "circuit open", retry_in)
+        wait = self.bucket.reserve(self.max_wait)
+        if wait is None:
+            self._count("rejected")
+            raise ProviderUnavailable(self.name, "rate limit reached", self.bucket.wait_time())
+        self._count("calls")
+        return wait
+
+    def _on_failure(self, exc: Exception, attempt: int) -> float | None:
+        """Record a failed attempt; returns the backoff before retrying, or ``None`` to give up."""
+        transient = _is_transient(exc)
+        retry_after = _retry_after(exc)
+        if _status_code(exc) == 429 or retry_after is not None:
+            self.bucket.block(retry_after or BACKOFF_BASE_SECONDS)
+
+        # Non-idempotent providers are only retried when the request never reached them.
+        retryable = transient and (self.idempotent or _never_sent(exc))
+        if retryable and attempt < self.max_attempts and (retry_after or 0.0) <= self.max_wait:
+            self._count("retries")
+            backoff = min(BACKOFF_BASE_SECONDS * 2 ** (attempt - 1), BACKOFF_MAX_SECONDS)
+            delay = max(retry_after or 0.0, random.uniform(0, backoff))
+            logger.warning("%s call failed (%s), retrying in %.1fs", self.name, exc, delay)
+            return delay
+
+        # Only transient failures that survive the retries count towards opening the circuit.
+        self._count("failures")
+        if not transient:
+            # The provider answered (e.g. a 4xx for a bad request), so it is up.
+            self.breaker.record_success()
+        elif self.breaker.record_failure():
+            logger.warning("%s circuit opened for %.0fs after: %s", self.name, self.breaker.reset_seconds, exc)
+        return None
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        attempt = 0
+        while True:
+            attempt += 1
+            time.sleep(self._admit())
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                delay = self._on_failure(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(self._admit())
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as exc:
+                delay = self._on_failure(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def state(self) -> dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_in_seconds": round(self.breaker.retry_in(), 1),
+            "tokens_available": round(self.bucket.available(), 2),
+            "per_minute": round(self.bucket.rate * 60, 3),
+            "burst": self.bucket.capacity,
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+_providers: dict[str, Provider] = {}
+_providers_lock = threading.Lock()
+
+
+def provider(name: str) -> Provider:
+    """Return the process-wide limiter for ``name``, configured from the environment on first use."""
+    with _providers_lock:
+        if name not in _providers:
+            _providers[name] = Provider.from_env(name)
+        return _providers[name]
+
+
+def provider_states() -> dict[str, dict[str, Any]]:
+    """State of every provider's limiter and breaker, for monitoring."""
+    return {name: provider(name).state() for name in DEFAULT_QUOTAS}
@@ -5,6 +5,8 @@ from typing import Any
 
 import praw
 
+from services.rate_limit import provider
+
 TARGET_SUBREDDITS = ["india", "indiainvestments", "bollywood", "technology"]
 
 
@@ -26,11 +28,12 @@ def _build_reddit_client() -> praw.Reddit:
 def fetch_reddit_hot_posts(limit_per_subreddit: int = 25) -> list[dict[str, Any]]:
     """Fetch hot posts from selected subreddits."""
     reddit = _build_reddit_client()
+    limiter = provider("reddit")
 
     posts: list[dict[str, Any]] = []
     for subreddit_name in TARGET_SUBREDDITS:
         subreddit = reddit.subreddit(subreddit_name)
-        for post in subreddit.hot(limit=limit_per_subreddit):
+        for post in limiter.call(lambda: list(subreddit.hot(limit=limit_per_subreddit))):
             posts.append(
                 {
                     "title": post.title,
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any
+
+from sqlalchemy import DateTime, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_TOKENS = 12
+
+# Each index is an external-content FTS5 table kept in sync with its source
+# table by triggers, so the text is stored once and writes stay incremental.
+FTS_INDEXES: dict[str, dict[str, Any]] = {
+    "trends_fts": {"table": "trends", "columns": ["topic", "description"]},
+    "competitor_posts_fts": {"table": "competitor_posts", "columns": ["caption"]},
+}
+
+
+def _index_ddl(name: str, table: str, columns: list[str]) -> list[str]:
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {name}({name}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {name}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS5 indexes and their sync triggers for the tables present in ``engine``.
+
+    An index created for an existing table is backfilled once with ``rebuild``.
+    Full-text search is SQLite-only; other dialects are skipped.
+    """
+    if engine.dialect.name != "sqlite":
+        logger.info("Full-text search indexes are only created on SQLite")
+        return
+
+    tables = set(inspect(engine).get_table_names())
+    with engine.begin() as conn:
+        for name, spec in FTS_INDEXES.items():
+            if spec["table"] not in tables:
+                continue
+            for statement in _index_ddl(name, spec["table"], spec["columns"]):
+                conn.exec_driver_sql(statement)
+            if name not in tables:
+                conn.exec_driver_sql(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+
+
+def fts_query(query: str) -> str:
+    """Turn free text into a safe FTS5 query: every word must match, the last as a prefix."""
+    tokens = re.findall(r"\w+", query)
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_trends(db: Session, query: str, limit: int = 20) -> list[dict[str, Any]]:
+    match = fts_query(query)
+    if not match:
+        return []
+
+    rows = db.execute(
+        text(
+            "SELECT t.id, t.source, t.topic, t.url, t.fetched_at, "
+            f"snippet(trends_fts, -1, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) AS snippet, "
+            "bm25(trends_fts, 10.0, 1.0) AS rank "
+            "FROM trends_fts JOIN trends t ON t.id = trends_fts.rowid "
+            "WHERE trends_fts MATCH :match ORDER BY rank LIMIT :limit"
+        ).columns(fetched_at=DateTime),
+        {"match": match, "limit": limit},
+    )
+    return [dict(row._mapping) for row in rows]
+
+
+def search_posts(db: Session, query: str, limit: int = 20) -> list[dict[str, Any]]:
+    match = fts_query(query)
+    if not match:
+        return []
+
+    rows = db.execute(
+        text(
+            "SELECT p.id, p.competitor_id, p.post_url, p.post_type, p.posted_at, "
+            f"snippet(competitor_posts_fts, 0, '<mark>', '</mark>', '…', {SNIPPET_TOKENS}) AS snippet, "
+            "bm25(competitor_posts_fts) AS rank "
+            "FROM competitor_posts_fts JOIN competitor_posts p ON p.id = competitor_posts_fts.rowid "
+            "WHERE competitor_posts_fts MATCH :match ORDER BY rank LIMIT :limit"
+        ).columns(posted_at=DateTime),
+        {"match": match, "limit": limit},
+    )
+    return [dict(row._mapping) for row in rows]
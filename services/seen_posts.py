@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+DEFAULT_MAX_SIZE = 100_000
+
+
+class SeenPostFilter:
+    """Bounded LRU set of post keys (URLs or IDs) that have been stored.
+
+    Membership is exact, so the filter never hides a new post, but a key may
+    outlive its row once retention or a competitor deletion removes it. Evicted
+    keys fall back to the database's ``ON CONFLICT`` insert. Each key can carry a
+    value, such as the row id.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.max_size = max(1, max_size)
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> SeenPostFilter:
+        return cls(int(os.getenv("SEEN_POST_FILTER_SIZE", DEFAULT_MAX_SIZE)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def add(self, key: str, value: Any = None) -> None:
+        self.update({key: value})
+
+    def update(self, entries: Mapping[str, Any] | Iterable[str]) -> None:
+        items = entries.items() if isinstance(entries, Mapping) else ((key, None) for key in entries)
+        with self._lock:
+            for key, value in items:
+                if value is None and self._entries.get(key) is not None:
+                    value = self._entries[key]
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
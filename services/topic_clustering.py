@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import re
+import struct
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db.upsert import insert_for
+from models.trend import Trend, TrendLshBucket
+
+BANDS = 20
+ROWS_PER_BAND = 3
+NUM_PERM = BANDS * ROWS_PER_BAND
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+QUERY_CHUNK_SIZE = 500
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_BUCKET_MASK = (1 << 63) - 1
+
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)
+]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in", "is", "it",
+    "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with",
+}
+
+
+def _similarity_threshold() -> float:
+    return float(os.getenv("TREND_CLUSTER_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD))
+
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little")
+
+
+def shingles(text: str) -> set[str]:
+    """Word shingles of ``text``: lowercase alphanumeric tokens minus common stopwords."""
+    return {token for token in re.findall(r"[a-z0-9]+", text.lower()) if token not in STOPWORDS}
+
+
+def signature(tokens: Iterable[str]) -> list[int]:
+    """MinHash signature of a shingle set, one 32-bit value per permutation."""
+    hashes = [_hash64(token.encode()) for token in tokens]
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH for a, b in _PERMUTATIONS]
+
+
+def similarity(left: list[int], right: list[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+def band_keys(sig: list[int]) -> list[int]:
+    """LSH bucket keys, one per band; signatures sharing any key are candidate duplicates."""
+    keys = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        keys.append(_hash64(struct.pack(f"<I{ROWS_PER_BAND}I", band, *rows)) & _BUCKET_MASK)
+    return keys
+
+
+def pack_signature(sig: list[int]) -> bytes:
+    return struct.pack(f"<{NUM_PERM}I", *sig)
+
+
+def unpack_signature(data: bytes) -> list[int]:
+    return list(struct.unpack(f"<{NUM_PERM}I", data))
+
+
+def _chunks(values: list[int]) -> Iterable[list[int]]:
+    for i in range(0, len(values), QUERY_CHUNK_SIZE):
+        yield values[i : i + QUERY_CHUNK_SIZE]
+
+
+def cluster_trends(db: Session, trends: list[Trend]) -> None:
+    """Assign ``cluster_id`` to trends not clustered yet; the caller commits."""
+    pending = sorted((trend for trend in trends if trend.minhash is None), key=lambda trend: trend.id)
+    if not pending:
+        return
+
+    signatures = {trend.id: signature(shingles(trend.topic_key or trend.topic)) for trend in pending}
+    keys_by_trend = {trend_id: band_keys(sig) for trend_id, sig in signatures.items()}
+
+    # Candidates come from the persistent bucket index and from trends clustered earlier in this call.
+    members: dict[int, set[int]] = defaultdict(set)
+    all_keys = sorted({key for keys in keys_by_trend.values() for key in keys})
+    for chunk in _chunks(all_keys):
+        rows = db.execute(
+            select(TrendLshBucket.bucket_key, TrendLshBucket.trend_id).where(TrendLshBucket.bucket_key.in_(chunk))
+        )
+        for bucket_key, trend_id in rows:
+            members[bucket_key].add(trend_id)
+
+    known: dict[int, tuple[int, list[int]]] = {}
+    candidate_ids = sorted({trend_id for ids in members.values() for trend_id in ids} - signatures.keys())
+    for chunk in _chunks(candidate_ids):
+        rows = db.execute(
+            select(Trend.id, Trend.cluster_id, Trend.minhash).where(Trend.id.in_(chunk), Trend.minhash.is_not(None))
+        )
+        for trend_id, cluster_id, minhash in rows:
+            known[trend_id] = (cluster_id or trend_id, unpack_signature(minhash))
+
+    threshold = _similarity_threshold()
+    buckets: list[dict[str, int]] = []
+    for trend in pending:
+        sig = signatures[trend.id]
+        keys = keys_by_trend[trend.id]
+
+        # Join the most similar candidate's cluster, or start one under this trend's id.
+        best_cluster, best_score = None, threshold
+        for candidate_id in {trend_id for key in keys for trend_id in members[key]}:
+            if candidate_id not in known:
+                continue
+            cluster_id, candidate_sig = known[candidate_id]
+            score = similarity(sig, candidate_sig)
+            if score >= best_score:
+                best_cluster, best_score = cluster_id, score
+
+        trend.cluster_id = best_cluster or trend.id
+        trend.minhash = pack_signature(sig)
+        known[trend.id] = (trend.cluster_id, sig)
+        for key in keys:
+            members[key].add(trend.id)
+            buckets.append({"bucket_key": key, "trend_id": trend.id})
+
+    db.execute(insert_for(db, TrendLshBucket).on_conflict_do_nothing(), buckets)
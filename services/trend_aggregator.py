@@ -1,45 +1,145 @@
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from datetime import datetime, timezone
+from typing import Any
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from models.trend import Trend
+from db.upsert import insert_for
+from models.trend import Trend, TrendRun, normalize_topic
 from services.google_trends import fetch_google_trends_india
 from services.news_service import fetch_india_headlines
 from services.reddit_service import fetch_reddit_hot_posts
+from services.topic_clustering import cluster_trends
+from services.trend_cache import trend_cache
+from services.trend_scoring import parse_traffic, score_trends
 
+logger = logging.getLogger(__name__)
 
-def _normalized_topic(topic: str) -> str:
-    return " ".join(topic.lower().split())
+DEFAULT_SOURCE_TIMEOUT_SECONDS = 45.0
+
+SOURCE_FETCHERS: dict[str, Callable[[], list[dict[str, Any]]]] = {
+    "google": fetch_google_trends_india,
+    "news": fetch_india_headlines,
+    "reddit": fetch_reddit_hot_posts,
+}
+
+
+def _parse_published_at(value: Any) -> datetime | None:
+    """NewsAPI ``publishedAt`` (ISO 8601, usually ``Z``-suffixed) as naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _upsert_trends(db: Session, rows: list[dict[str, Any]]) -> list[Trend]:
+    """Insert new trends and refresh the ones already stored for the same source and topic."""
+    if not rows:
+        return []
+
+    stmt = insert_for(db, Trend).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source", "topic_key"],
+        set_={
+            "topic": stmt.excluded.topic,
+            "description": stmt.excluded.description,
+            "url": stmt.excluded.url,
+            "signal": stmt.excluded.signal,
+            "published_at": stmt.excluded.published_at,
+            "niche_tags": stmt.excluded.niche_tags,
+            "fetched_at": stmt.excluded.fetched_at,
+            "last_seen_at": stmt.excluded.last_seen_at,
+            "seen_count": Trend.seen_count + 1,
+        },
+    )
+    return list(db.scalars(stmt.returning(Trend), execution_options={"populate_existing": True}))
+
+
+def _source_timeout(source: str) -> float:
+    default = os.getenv("TREND_SOURCE_TIMEOUT_SECONDS", DEFAULT_SOURCE_TIMEOUT_SECONDS)
+    return float(os.getenv(f"TREND_{source.upper()}_TIMEOUT_SECONDS", default))
+
+
+def _fetch_sources(run: TrendRun) -> dict[str, list[dict[str, Any]]]:
+    """Run every source fetcher concurrently, each bounded by its own deadline.
+
+    Sources that time out or raise are recorded on ``run`` and left out of the
+    result. Stragglers keep running in the background, but nothing waits for them.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(SOURCE_FETCHERS), thread_name_prefix="trend-source")
+    started = time.monotonic()
+    futures = {source: executor.submit(fetcher) for source, fetcher in SOURCE_FETCHERS.items()}
+
+    results: dict[str, list[dict[str, Any]]] = {}
+    timed_out: list[str] = []
+    failed: list[str] = []
+    try:
+        for source, future in futures.items():
+            remaining = _source_timeout(source) - (time.monotonic() - started)
+            try:
+                results[source] = future.result(timeout=max(0.0, remaining))
+            except FuturesTimeoutError:
+                timed_out.append(source)
+                logger.warning("Trend source %s timed out", source)
+            except Exception:
+                failed.append(source)
+                logger.exception("Trend source %s failed", source)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    run.completed_sources = ",".join(results) or None
+    run.timed_out_sources = ",".join(timed_out) or None
+    run.failed_sources = ",".join(failed) or None
+    return results
 
 
 def aggregate_trends(db: Session) -> list[Trend]:
-    """Fetch, deduplicate, and persist trends from all sources."""
-    google_items = fetch_google_trends_india()
-    news_items = fetch_india_headlines()
-    reddit_items = fetch_reddit_hot_posts()
+    """Fetch, deduplicate, cluster and score trends from all sources, recording the run in ``trend_runs``."""
+    run = TrendRun(started_at=datetime.utcnow())
+    results = _fetch_sources(run)
+    google_items = results.get("google", [])
+    news_items = results.get("news", [])
+    reddit_items = results.get("reddit", [])
 
     seen_topics: set[str] = set()
-    trend_models: list[Trend] = []
+    rows: list[dict[str, Any]] = []
     now = datetime.utcnow()
 
-    for item in google_items:
+    traffic = parse_traffic(item.get("search_volume") for item in google_items)
+    for item, search_volume in zip(google_items, traffic):
         topic = item.get("topic")
         if not topic:
             continue
-        key = _normalized_topic(topic)
+        key = normalize_topic(topic)
         if key in seen_topics:
             continue
         seen_topics.add(key)
-        trend_models.append(
-            Trend(
+        rows.append(
+            dict(
                 source="google",
                 topic=topic,
+                topic_key=key,
                 description=item.get("description"),
                 url=item.get("url"),
                 relevance_score=None,
+                signal=None if np.isnan(search_volume) else float(search_volume),
+                published_at=None,
                 fetched_at=now,
+                first_seen_at=now,
+                last_seen_at=now,
                 niche_tags="search,india",
             )
         )
@@ -48,18 +148,23 @@ def aggregate_trends(db: Session) -> list[Trend]:
         topic = item.get("headline")
         if not topic:
             continue
-        key = _normalized_topic(topic)
+        key = normalize_topic(topic)
         if key in seen_topics:
             continue
         seen_topics.add(key)
-        trend_models.append(
-            Trend(
+        rows.append(
+            dict(
                 source="news",
                 topic=topic,
+                topic_key=key,
                 description=item.get("description") or item.get("source"),
                 url=item.get("url"),
                 relevance_score=None,
+                signal=None,
+                published_at=_parse_published_at(item.get("published_at")),
                 fetched_at=now,
+                first_seen_at=now,
+                last_seen_at=now,
                 niche_tags=f"news,{item.get('category', 'general')}",
             )
         )
@@ -68,24 +173,35 @@ def aggregate_trends(db: Session) -> list[Trend]:
         topic = item.get("title")
         if not topic:
             continue
-        key = _normalized_topic(topic)
+        key = normalize_topic(topic)
         if key in seen_topics:
             continue
         seen_topics.add(key)
-        trend_models.append(
-            Trend(
+        rows.append(
+            dict(
                 source="reddit",
                 topic=topic,
+                topic_key=key,
                 description=item.get("description") or item.get("subreddit"),
                 url=item.get("url"),
-                relevance_score=float(item.get("score")) if item.get("score") is not None else None,
+                relevance_score=None,
+                signal=float(item.get("score")) if item.get("score") is not None else None,
+                published_at=None,
                 fetched_at=now,
+                first_seen_at=now,
+                last_seen_at=now,
                 niche_tags=f"reddit,{item.get('subreddit')}",
             )
         )
 
-    if trend_models:
-        db.add_all(trend_models)
-        db.commit()
+    trend_models = _upsert_trends(db, rows)
+    cluster_trends(db, trend_models)
+    score_trends(db, now)
+
+    run.trend_count = len(trend_models)
+    run.finished_at = datetime.utcnow()
+    db.add(run)
+    db.commit()
+    trend_cache.invalidate()
 
     return trend_models
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class TrendCache:
+    """In-process cache of serialized trend responses, invalidated per aggregation run."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        # Bumped by invalidate(); ETags and cached bodies are tied to it.
+        self.generation = 0
+        # The generation restarts with the process, so ETags also carry a nonce.
+        self.nonce = uuid.uuid4().hex[:8]
+        self.last_modified = datetime.now(tz=timezone.utc).replace(microsecond=0)
+        self._entries: OrderedDict[Hashable, tuple[int, CachedResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def state(self) -> tuple[int, datetime]:
+        with self._lock:
+            return self.generation, self.last_modified
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.last_modified = datetime.now(tz=timezone.utc).replace(microsecond=0)
+            self._entries.clear()
+
+    def etag(self, key: Hashable, generation: int) -> str:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        return f'W/"trends-{self.nonce}-{generation}-{digest}"'
+
+    def get(self, key: Hashable, generation: int) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, generation: int, response: CachedResponse) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+trend_cache = TrendCache()
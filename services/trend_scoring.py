@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from models.trend import Trend
+
+DEFAULT_HISTORY_HOURS = 48
+DEFAULT_HALF_LIFE_HOURS = 12
+# Score multiplier added for each source beyond the first that covers a topic cluster.
+CROSS_SOURCE_BONUS = 0.25
+# Base score of items without a usable signal, e.g. Google's fallback list without traffic.
+NEUTRAL_SCORE = 0.5
+
+_TRAFFIC_UNITS = {"": 1.0, "K": 1e3, "M": 1e6, "B": 1e9}
+
+
+def _history() -> timedelta:
+    return timedelta(hours=float(os.getenv("TREND_SCORE_HISTORY_HOURS", DEFAULT_HISTORY_HOURS)))
+
+
+def _half_life_hours() -> float:
+    return float(os.getenv("TREND_SCORE_HALF_LIFE_HOURS", DEFAULT_HALF_LIFE_HOURS))
+
+
+def parse_traffic(values: Iterable[object]) -> np.ndarray:
+    """Google ``formattedTraffic`` strings such as ``"200K+"`` or ``"2,000+"`` as floats; NaN if unparsable."""
+    text = pd.Series(list(values), dtype="object").astype("string").str.replace(",", "", regex=False)
+    parts = text.str.upper().str.extract(r"([0-9]*\.?[0-9]+)\s*([KMB]?)")
+    numbers = pd.to_numeric(parts[0], errors="coerce")
+    return (numbers * parts[1].map(_TRAFFIC_UNITS)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def score_frame(frame: pd.DataFrame, now: datetime) -> pd.Series:
+    """Relevance score of each row of ``frame``, comparable across sources: base x recency decay x cluster bonus."""
+    # 0-1 base score: traffic percentile for Google, score percentile within the
+    # subreddit for Reddit (so small subreddits are not drowned out), 1 for news.
+    base = pd.Series(NEUTRAL_SCORE, index=frame.index, dtype=float)
+
+    google = frame["source"].eq("google") & frame["signal"].notna()
+    base[google] = np.log1p(frame.loc[google, "signal"]).rank(pct=True)
+
+    reddit = frame["source"].eq("reddit") & frame["signal"].notna()
+    base[reddit] = (
+        np.log1p(frame.loc[reddit, "signal"].clip(lower=0)).groupby(frame.loc[reddit, "subreddit"]).rank(pct=True)
+    )
+
+    base[frame["source"].eq("news")] = 1.0
+
+    # Halved every TREND_SCORE_HALF_LIFE_HOURS since publication (news) or since last seen.
+    seen_at = frame["published_at"].where(frame["source"].eq("news")).fillna(frame["last_seen_at"])
+    age_hours = ((np.datetime64(now) - seen_at.to_numpy(dtype="datetime64[ns]")) / np.timedelta64(1, "h")).clip(min=0)
+    decay = np.exp2(-age_hours / _half_life_hours())
+
+    # 1 + CROSS_SOURCE_BONUS for every other source covering the same cluster.
+    clustered = frame["cluster_id"].notna()
+    sources = frame.loc[clustered].groupby("cluster_id")["source"].transform("nunique")
+    bonus = 1 + CROSS_SOURCE_BONUS * (sources.reindex(frame.index).fillna(1) - 1)
+
+    return (base * decay * bonus).round(6)
+
+
+def score_trends(db: Session, now: datetime | None = None) -> int:
+    """Rescore every trend seen within ``TREND_SCORE_HISTORY_HOURS``; the caller commits. Returns rows updated."""
+    now = now or datetime.utcnow()
+    # Include the current run's pending rows.
+    db.flush()
+    stmt = select(
+        Trend.id,
+        Trend.source,
+        Trend.signal,
+        Trend.niche_tags,
+        Trend.published_at,
+        Trend.last_seen_at,
+        Trend.cluster_id,
+        Trend.relevance_score,
+    ).where(Trend.last_seen_at >= now - _history())
+    frame = pd.DataFrame(db.execute(stmt).all(), columns=[column.name for column in stmt.selected_columns])
+    if frame.empty:
+        return 0
+
+    frame["signal"] = pd.to_numeric(frame["signal"], errors="coerce")
+    frame["subreddit"] = frame["niche_tags"].str.split(",", n=1).str[1].where(frame["source"].eq("reddit"))
+    frame["published_at"] = pd.to_datetime(frame["published_at"])
+    frame["last_seen_at"] = pd.to_datetime(frame["last_seen_at"])
+    scores = score_frame(frame, now)
+
+    previous = frame["relevance_score"].astype(float)
+    changed = previous.isna() | ~np.isclose(previous.fillna(0), scores)
+    if not changed.any():
+        return 0
+
+    updates = pd.DataFrame({"id": frame.loc[changed, "id"], "relevance_score": scores[changed]})
+    db.execute(update(Trend), updates.to_dict("records"))
+    return len(updates)
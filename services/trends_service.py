@@ -5,10 +5,13 @@ import praw
 from newsapi import NewsApiClient
 from pytrends.request import TrendReq
 
+from services.rate_limit import provider
+
 
 def fetch_google_trends() -> list[str]:
-    pytrends = TrendReq(hl="en-US", tz=int(os.getenv("GOOGLE_TRENDS_TZ", "360")))
-    trending = pytrends.trending_searches(pn=os.getenv("GOOGLE_TRENDS_GEO", "united_states"))
+    limiter = provider("pytrends")
+    pytrends = limiter.call(TrendReq, hl="en-US", tz=int(os.getenv("GOOGLE_TRENDS_TZ", "360")))
+    trending = limiter.call(pytrends.trending_searches, pn=os.getenv("GOOGLE_TRENDS_GEO", "united_states"))
     return trending[0].tolist()[:10]
 
 
@@ -18,7 +21,7 @@ def fetch_newsapi_trends() -> list[str]:
         return []
 
     news_client = NewsApiClient(api_key=api_key)
-    headlines = news_client.get_top_headlines(language="en", page_size=10)
+    headlines = provider("newsapi").call(news_client.get_top_headlines, language="en", page_size=10)
     return [article["title"] for article in headlines.get("articles", []) if article.get("title")]
 
 
@@ -35,7 +38,8 @@ def fetch_reddit_trends() -> list[str]:
         client_secret=reddit_client_secret,
         user_agent=reddit_user_agent,
     )
-    return [submission.title for submission in reddit.subreddit("all").hot(limit=10)]
+    submissions = provider("reddit").call(lambda: list(reddit.subreddit("all").hot(limit=10)))
+    return [submission.title for submission in submissions]
 
 
 def collect_all_trending_topics() -> dict[str, list[str]]:
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from jobs import competitor_checker
+from models.base import Base
+from models.competitor import Competitor, CompetitorPost
+from models.notification import NotificationOutbox
+from services import instagram_monitor
+
+NOW = datetime.utcnow()
+
+
+class FakeActor:
+    """Stands in for the Apify actor, honouring ``limit`` and ``newer_than`` like the real one."""
+
+    def __init__(self, posts: list[dict]) -> None:
+        self.posts = posts
+
+    def __call__(self, handles, limit=instagram_monitor.DEFAULT_LIMIT, newer_than=None):
+        return {
+            handle: [post for post in self.posts if newer_than is None or post["timestamp"] > newer_than][:limit]
+            for handle in handles
+        }
+
+
+def payload(index: int, posted_at: datetime) -> dict:
+    return {
+        "post_url": f"https://instagram.com/p/post{index}",
+        "caption": f"post {index}",
+        "post_type": "image",
+        "timestamp": posted_at,
+        "likes_count": None,
+        "views_count": None,
+        "is_pinned": False,
+    }
+
+
+def store(session_factory, posts: list[dict]) -> None:
+    with session_factory() as db:
+        competitor = Competitor(name="Dormant", instagram_handle="dormant")
+        db.add(competitor)
+        db.flush()
+        db.add_all(
+            CompetitorPost(
+                competitor_id=competitor.id,
+                post_url=post["post_url"],
+                posted_at=post["timestamp"],
+                detected_at=post["timestamp"],
+            )
+            for post in posts
+        )
+        db.commit()
+
+
+def restart(session_factory) -> None:
+    """A restart forgets the in-memory filter and rebuilds it from what is left in the database."""
+    competitor_checker.seen_posts.clear()
+    competitor_checker._warm_seen_posts(session_factory)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setenv("ARCHIVE_DIR", str(tmp_path))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    competitor_checker.seen_posts.clear()
+    yield sessionmaker(bind=engine, autoflush=False)
+    competitor_checker.seen_posts.clear()
+    engine.dispose()
+
+
+def test_archived_posts_are_not_detected_again_after_restart(session_factory, monkeypatch):
+    old = [payload(index, NOW - timedelta(days=120, hours=index)) for index in range(12)]
+    store(session_factory, old)
+
+    assert competitor_checker.archive_old_posts(session_factory) == 11
+
+    restart(session_factory)
+    monkeypatch.setattr(instagram_monitor, "fetch_recent_posts_batch", FakeActor(old))
+
+    assert competitor_checker.run_competitor_check(session_factory) == 0
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).select_from(CompetitorPost)) == 1
+        assert db.scalar(select(func.count()).select_from(NotificationOutbox)) == 0
+
+
+def test_new_post_after_archiving_is_detected(session_factory, monkeypatch):
+    old = [payload(index, NOW - timedelta(days=120, hours=index)) for index in range(3)]
+    store(session_factory, old)
+    competitor_checker.archive_old_posts(session_factory)
+    restart(session_factory)
+
+    fresh = payload(99, NOW - timedelta(hours=1))
+    monkeypatch.setattr(instagram_monitor, "fetch_recent_posts_batch", FakeActor([fresh, *old]))
+
+    assert competitor_checker.run_competitor_check(session_factory) == 1
+    with session_factory() as db:
+        assert db.scalar(select(NotificationOutbox.message).where(NotificationOutbox.message.contains("post99")))
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.orm import Session
+
+from core.database import Base
+from db.migrations import TREND_KEY_INDEX, upgrade_trends
+from db.upsert import insert_for
+from models.trend import Trend
+
+# The trends table as created before trends were upserted.
+OLD_TRENDS = """
+CREATE TABLE trends (
+    id INTEGER NOT NULL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL,
+    topic VARCHAR(500) NOT NULL,
+    description TEXT,
+    url VARCHAR(1024),
+    relevance_score FLOAT,
+    fetched_at DATETIME,
+    niche_tags TEXT
+)
+"""
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'trends.db'}")
+    yield engine
+    engine.dispose()
+
+
+def old_run(engine, fetched_at: datetime, topics: list[tuple[str, str]]) -> None:
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO trends (source, topic, fetched_at) VALUES (?, ?, ?)",
+            [(source, topic, fetched_at) for source, topic in topics],
+        )
+
+
+def test_upgrade_merges_runs_of_an_old_table(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(OLD_TRENDS)
+    old_run(engine, datetime(2024, 1, 1), [("google", "IPL Final"), ("news", "IPL final")])
+    old_run(engine, datetime(2024, 1, 2), [("google", "ipl  final"), ("google", "Budget 2024")])
+    old_run(engine, datetime(2024, 1, 3), [("google", "IPL Final")])
+
+    upgrade_trends(engine)
+
+    with Session(engine) as db:
+        rows = {(trend.source, trend.topic_key): trend for trend in db.scalars(select(Trend))}
+    assert set(rows) == {("google", "ipl final"), ("news", "ipl final"), ("google", "budget 2024")}
+    ipl = rows["google", "ipl final"]
+    assert ipl.seen_count == 3
+    assert ipl.first_seen_at == datetime(2024, 1, 1)
+    assert ipl.last_seen_at == datetime(2024, 1, 3)
+    assert rows["news", "ipl final"].seen_count == 1
+
+
+def test_upgraded_table_accepts_upserts(engine):
+    with engine.begin() as conn:
+        conn.exec_driver_sql(OLD_TRENDS)
+    old_run(engine, datetime(2024, 1, 1), [("google", "IPL Final"), ("google", "IPL Final")])
+    upgrade_trends(engine)
+
+    with Session(engine) as db:
+        stmt = insert_for(db, Trend).values(source="google", topic="IPL Final", topic_key="ipl final")
+        db.execute(stmt.on_conflict_do_update(index_elements=["source", "topic_key"], set_={"seen_count": 5}))
+        db.commit()
+        assert db.scalars(select(Trend.seen_count)).all() == [5]
+
+
+def test_upgrade_is_a_no_op_on_a_current_table(engine):
+    Base.metadata.create_all(engine, tables=[Trend.__table__])
+    indexes = inspect(engine).get_indexes("trends")
+
+    upgrade_trends(engine)
+    upgrade_trends(engine)
+
+    assert inspect(engine).get_indexes("trends") == indexes
+    assert TREND_KEY_INDEX not in {index["name"] for index in indexes}
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from models.notification import NotificationOutbox
+from services import notification
+from services.notification import FAILED, PENDING, SENT, NotificationDispatcher, enqueue_alert
+from services.rate_limit import ProviderUnavailable
+
+
+class FakeProvider:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.sent: list[str] = []
+
+    async def acall(self, fn, *, chat_id, text):
+        if self.error is not None:
+            raise self.error
+        self.sent.append(text)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    NotificationOutbox.__table__.create(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def dispatch(session_factory, fake: FakeProvider, monkeypatch) -> list[NotificationOutbox]:
+    monkeypatch.setattr(notification, "provider", lambda name: fake)
+    dispatcher = NotificationDispatcher(session_factory, token="token", chat_id="chat")
+    dispatcher.min_send_interval = 0
+    asyncio.run(dispatcher.dispatch_pending(bot=SimpleNamespace(send_message=None)))
+    with session_factory() as db:
+        return list(db.query(NotificationOutbox).order_by(NotificationOutbox.id))
+
+
+def queue(session_factory, *alerts: tuple[str, str]) -> None:
+    with session_factory() as db:
+        for group_key, message in alerts:
+            enqueue_alert(db, group_key, message, summary=message)
+        db.commit()
+
+
+def test_alerts_of_one_group_are_merged(session_factory, monkeypatch):
+    queue(session_factory, ("brand", "first"), ("brand", "second"), ("other", "third"))
+    fake = FakeProvider()
+
+    entries = dispatch(session_factory, fake, monkeypatch)
+
+    assert [entry.status for entry in entries] == [SENT] * 3
+    assert len(fake.sent) == 2
+    assert "2 new posts from @brand" in fake.sent[0]
+
+
+def test_refused_sends_do_not_count_as_attempts(session_factory, monkeypatch):
+    queue(session_factory, ("brand", "first"))
+    fake = FakeProvider(ProviderUnavailable("telegram", "circuit open", retry_in=30))
+
+    for _ in range(10):
+        with session_factory() as db:
+            db.query(NotificationOutbox).update({"next_attempt_at": datetime.utcnow()})
+            db.commit()
+        [entry] = dispatch(session_factory, fake, monkeypatch)
+
+    assert entry.status == PENDING
+    assert entry.attempts == 0
+    assert entry.next_attempt_at > datetime.utcnow()
+
+
+def test_failed_sends_give_up_after_max_attempts(session_factory, monkeypatch):
+    monkeypatch.setenv("NOTIFICATION_MAX_ATTEMPTS", "2")
+    queue(session_factory, ("brand", "first"))
+    fake = FakeProvider(RuntimeError("bad request"))
+
+    for _ in range(2):
+        with session_factory() as db:
+            db.query(NotificationOutbox).update({"next_attempt_at": datetime.utcnow()})
+            db.commit()
+        [entry] = dispatch(session_factory, fake, monkeypatch)
+
+    assert entry.status == FAILED
+    assert entry.attempts == 2
+    assert entry.last_error == "bad request"
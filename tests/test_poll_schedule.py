@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.base import Base
+from models.competitor import Competitor, CompetitorPost
+from services import poll_schedule
+from services.poll_schedule import DEFAULT_INTERVAL, POLLS_PER_GAP, PollQueue, estimate_interval
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(poll_schedule.random, "uniform", lambda low, high: 0.0)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Competitor.__table__, CompetitorPost.__table__])
+    with sessionmaker(bind=engine)() as session:
+        yield session
+    engine.dispose()
+
+
+def add_competitor(db, handle: str, last_checked_at: datetime | None, post_gaps_hours: list[int] = ()) -> int:
+    competitor = Competitor(name=handle, instagram_handle=handle, last_checked_at=last_checked_at)
+    db.add(competitor)
+    db.flush()
+    for hours in post_gaps_hours:
+        db.add(
+            CompetitorPost(
+                competitor_id=competitor.id,
+                post_url=f"https://instagram.com/p/{handle}{hours}",
+                posted_at=NOW - timedelta(hours=hours),
+                detected_at=NOW,
+            )
+        )
+    db.commit()
+    return competitor.id
+
+
+def test_estimate_interval_without_history_uses_default():
+    assert estimate_interval([], NOW) == DEFAULT_INTERVAL
+    assert estimate_interval([NOW], NOW) == DEFAULT_INTERVAL
+
+
+def test_estimate_interval_polls_several_times_per_gap():
+    posts = [NOW - timedelta(hours=hours) for hours in (0, 8, 16)]
+
+    assert estimate_interval(posts, NOW) == timedelta(hours=8) / POLLS_PER_GAP
+
+
+def test_estimate_interval_backs_off_for_overdue_accounts():
+    posts = [NOW - timedelta(hours=hours) for hours in (40, 48)]
+
+    assert estimate_interval(posts, NOW) == timedelta(hours=20) / POLLS_PER_GAP
+
+
+def test_estimate_interval_is_clamped(monkeypatch):
+    monkeypatch.setenv("COMPETITOR_POLL_MIN_MINUTES", "15")
+    monkeypatch.setenv("COMPETITOR_POLL_MAX_HOURS", "24")
+    burst = [NOW - timedelta(minutes=minutes) for minutes in (0, 1, 2)]
+    dormant = [NOW - timedelta(days=days) for days in (300, 400)]
+
+    assert estimate_interval(burst, NOW) == timedelta(minutes=15)
+    assert estimate_interval(dormant, NOW) == timedelta(hours=24)
+
+
+def test_never_checked_competitors_are_due_now(db):
+    queue = PollQueue()
+    competitor_id = add_competitor(db, "fresh", None)
+
+    queue.sync(db, NOW)
+
+    assert queue.next_due() == NOW
+    assert queue.pop_due(NOW, limit=10) == [competitor_id]
+    assert len(queue) == 0
+
+
+def test_pop_due_returns_most_overdue_first_up_to_limit(db):
+    queue = PollQueue()
+    recent = add_competitor(db, "recent", NOW - timedelta(minutes=31))
+    stale = add_competitor(db, "stale", NOW - timedelta(hours=5))
+    later = add_competitor(db, "later", NOW)
+
+    queue.sync(db, NOW)
+
+    assert queue.pop_due(NOW, limit=1) == [stale]
+    assert queue.pop_due(NOW, limit=10) == [recent]
+    assert queue.next_due() == NOW + DEFAULT_INTERVAL
+    assert queue.pop_due(NOW + DEFAULT_INTERVAL, limit=10) == [later]
+
+
+def test_rescheduling_replaces_the_previous_entry(db):
+    queue = PollQueue()
+    competitor_id = add_competitor(db, "active", None, post_gaps_hours=[0, 4, 8])
+    queue.sync(db, NOW)
+
+    queue.schedule(db, [competitor_id], NOW, checked=True)
+
+    assert len(queue) == 1
+    assert queue.pop_due(NOW, limit=10) == []
+    assert queue.next_due() == NOW + timedelta(hours=1)
+
+
+def test_sync_forgets_deleted_competitors(db):
+    queue = PollQueue()
+    competitor_id = add_competitor(db, "gone", None)
+    queue.sync(db, NOW)
+
+    db.delete(db.get(Competitor, competitor_id))
+    db.commit()
+    queue.sync(db, NOW)
+
+    assert len(queue) == 0
+    assert queue.pop_due(NOW, limit=10) == []
@@ -0,0 +1,224 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services import rate_limit
+from services.rate_limit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, Provider, ProviderUnavailable, TokenBucket
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: 0.0)
+    return clock
+
+
+def make_provider(**overrides) -> Provider:
+    settings = {
+        "per_minute": 600,
+        "burst": 10,
+        "max_attempts": 3,
+        "max_wait": 30.0,
+        "failure_threshold": 2,
+        "reset_seconds": 60.0,
+    }
+    settings.update(overrides)
+    return Provider("test", **settings)
+
+
+def http_error(status: int, headers: dict[str, str] | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://example.com")
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(str(status), request=request, response=response)
+
+
+def failing(*errors: Exception):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return fn, calls
+
+
+def test_token_bucket_allows_burst_then_waits(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0) is None
+    assert bucket.reserve(max_wait=5) == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.reserve(max_wait=0)
+    bucket.reserve(max_wait=0)
+
+    clock.now += 10
+    assert bucket.available() == 2
+
+
+def test_token_bucket_block_delays_every_caller(clock):
+    bucket = TokenBucket(rate=1.0, capacity=5)
+    bucket.block(7)
+
+    assert bucket.wait_time() == pytest.approx(7)
+    assert bucket.reserve(max_wait=5) is None
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.state == OPEN
+    assert breaker.allow() == pytest.approx(60)
+
+    clock.now += 60
+    assert breaker.allow() == 0
+    assert breaker.state == HALF_OPEN
+    # Only one trial call is let through.
+    assert breaker.allow() > 0
+
+
+def test_breaker_half_open_failure_reopens_and_success_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    breaker.allow()
+
+    assert breaker.record_failure() is True
+    assert breaker.state == OPEN
+
+    clock.now += 60
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_call_retries_transient_failures(clock):
+    provider = make_provider()
+    fn, calls = failing(http_error(503), httpx.ConnectError("down"))
+
+    assert provider.call(fn) == "ok"
+    assert len(calls) == 3
+    assert provider.retries == 2
+    assert provider.breaker.state == CLOSED
+
+
+def test_call_does_not_retry_client_errors(clock):
+    provider = make_provider()
+    fn, calls = failing(http_error(404))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.call(fn)
+    assert len(calls) == 1
+    assert provider.breaker.failures == 0
+
+
+def test_call_gives_up_after_max_attempts_and_counts_one_failure(clock):
+    provider = make_provider(max_attempts=2)
+    fn, calls = failing(*[http_error(500)] * 5)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.call(fn)
+    assert len(calls) == 2
+    assert provider.failures == 1
+    assert provider.breaker.failures == 1
+
+
+def test_open_circuit_refuses_calls(clock):
+    provider = make_provider(max_attempts=1, failure_threshold=1)
+    fn, calls = failing(*[http_error(500)] * 5)
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.call(fn)
+
+    with pytest.raises(ProviderUnavailable) as excinfo:
+        provider.call(fn)
+    assert len(calls) == 1
+    assert excinfo.value.retry_in == pytest.approx(60)
+    assert provider.rejected == 1
+
+
+def test_quota_exhaustion_raises_provider_unavailable(clock):
+    provider = make_provider(per_minute=60, burst=1, max_wait=0)
+    provider.call(lambda: None)
+
+    with pytest.raises(ProviderUnavailable) as excinfo:
+        provider.call(lambda: None)
+    assert excinfo.value.retry_in == pytest.approx(1)
+
+
+def test_retry_after_blocks_the_bucket(clock):
+    provider = make_provider()
+    fn, calls = failing(http_error(429, {"Retry-After": "12"}))
+
+    assert provider.call(fn) == "ok"
+    assert len(calls) == 2
+    assert provider.bucket.wait_time() == pytest.approx(12)
+
+
+def test_retry_after_longer_than_max_wait_is_not_retried(clock):
+    provider = make_provider(max_wait=5)
+    fn, calls = failing(http_error(429, {"Retry-After": "120"}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        provider.call(fn)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("error", "attempts"),
+    [
+        (httpx.ReadTimeout("slow"), 1),
+        (http_error(502), 1),
+        (httpx.ConnectError("down"), 3),
+        (http_error(429), 3),
+    ],
+)
+def test_non_idempotent_provider_only_retries_unsent_requests(clock, error, attempts):
+    provider = make_provider(idempotent=False, failure_threshold=10)
+    fn, calls = failing(*[error] * 5)
+
+    with pytest.raises(type(error)):
+        provider.call(fn)
+    assert len(calls) == attempts
+
+
+def test_apify_is_not_idempotent():
+    assert Provider.from_env("apify").idempotent is False
+    assert Provider.from_env("reddit").idempotent is True
+
+
+def test_acall_retries_like_call(clock, monkeypatch):
+    async def no_sleep(seconds):
+        return None
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", no_sleep)
+    provider = make_provider()
+    attempts = []
+
+    async def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise http_error(500)
+        return "ok"
+
+    assert asyncio.run(provider.acall(fn)) == "ok"
+    assert len(attempts) == 2
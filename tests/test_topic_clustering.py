@@ -0,0 +1,55 @@
+from services.topic_clustering import (
+    BANDS,
+    NUM_PERM,
+    band_keys,
+    pack_signature,
+    shingles,
+    signature,
+    similarity,
+    unpack_signature,
+)
+
+
+def test_shingles_lowercase_and_drop_stopwords():
+    assert shingles("The Rise of AI, and the Fall of NFTs!") == {"rise", "ai", "fall", "nfts"}
+
+
+def test_signature_is_deterministic_and_order_independent():
+    sig = signature(["apple", "vision", "pro"])
+
+    assert len(sig) == NUM_PERM
+    assert sig == signature(["pro", "apple", "vision"])
+
+
+def test_similarity_estimates_jaccard():
+    base = shingles("apple unveils vision pro headset price launch date")
+    near = shingles("apple unveils vision pro headset price launch")
+    other = shingles("champions league final tickets sold out")
+
+    assert similarity(signature(base), signature(base)) == 1.0
+    assert similarity(signature(base), signature(near)) > 0.6
+    assert similarity(signature(base), signature(other)) < 0.2
+
+
+def test_empty_topics_share_a_signature():
+    assert signature(shingles("the and of")) == signature([])
+
+
+def test_band_keys_collide_for_near_duplicates_only():
+    base = band_keys(signature(shingles("apple unveils vision pro headset price launch date")))
+    near = band_keys(signature(shingles("apple unveils vision pro headset price launch")))
+    other = band_keys(signature(shingles("champions league final tickets sold out")))
+
+    assert len(base) == BANDS
+    assert set(base) & set(near)
+    assert not set(base) & set(other)
+
+
+def test_band_keys_fit_a_signed_bigint():
+    assert all(0 <= key < 2**63 for key in band_keys(signature(["topic"])))
+
+
+def test_pack_signature_round_trips():
+    sig = signature(["taylor", "swift", "tour"])
+
+    assert unpack_signature(pack_signature(sig)) == sig